@@ -2,29 +2,35 @@
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field, constr
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, EmailStr, Field, constr
 from typing import Optional, Dict
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 import numpy as np
+import asyncio
 import base64
-import json
-from datetime import datetime
+from functools import partial
+import orjson
+from datetime import datetime, timezone
 import time
+import logging
 
 from config import config
-from core.gemini_client import GeminiClient
-from core.transcription import TranscriptionEngine
+from core.gemini_client import GeminiClient, gemini_embedder
+from core.token_bucket import TokenBucket
+from core.gemini_client_cache import LLMCache, RedisCacheBackend
+from core.semantic_cache import SemanticCache
+from core.transcription import TranscriptionEngine, AsyncTranscriptionEngine
 from core.question_detector import QuestionDetector
 from core.context_manager import ContextManager
 from models import Context, HistoryEntry
 
 # Import production features
-from logger import log_info, log_error, log_warning, log_debug
+from logger import logger, log_info, log_error, log_warning, log_debug
 from metrics import (
-    request_count, request_duration, transcription_count, transcription_duration,
-    generation_count, generation_duration, question_detected_count, error_count,
+    request_counter, request_timer, transcription_count, transcription_duration,
+    generation_count, generation_duration, question_detected_count, error_counter,
     get_metrics
 )
 from rate_limiter import rate_limit, get_limiter
@@ -49,7 +55,8 @@ from db_operations import (
 app = FastAPI(
     title="Interview Copilot API",
     description="AI-powered interview assistance API with Google Gemini 2.5 Pro",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS Configuration
@@ -75,47 +82,55 @@ if not config.api_debug:
             if forwarded_proto != "https":
                 # Allow health check endpoints without HTTPS
                 if request.url.path not in ["/api/health", "/metrics"]:
-                    log_warning(f"Non-HTTPS request blocked: {request.url}", extra={
+                    log_warning("Non-HTTPS request blocked: %s", request.url, extra={
                         "client": request.client.host if request.client else "unknown",
                         "path": request.url.path
                     })
-                    return JSONResponse(
+                    return ORJSONResponse(
                         status_code=403,
                         content={"detail": "HTTPS required in production mode"}
                     )
         return await call_next(request)
 
+# Reject oversized bodies before they are buffered and parsed by Pydantic
+@app.middleware("http")
+async def limit_request_size(request: Request, call_next):
+    """Reject requests whose Content-Length exceeds the configured maximum."""
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > config.max_request_size:
+        return ORJSONResponse(
+            status_code=413,
+            content={"detail": f"Request body too large (max {config.max_request_size} bytes)"}
+        )
+    return await call_next(request)
+
 # Request logging middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """Log all incoming requests."""
-    start_time = time.time()
-
-    log_info(f"Incoming request: {request.method} {request.url.path}", extra={
-        "method": request.method,
-        "path": request.url.path,
-        "client": request.client.host if request.client else "unknown"
-    })
+    start_time = time.perf_counter()
+    log_enabled = logger.isEnabledFor(logging.INFO)
+
+    if log_enabled:
+        log_info("Incoming request: %s %s", request.method, request.url.path, extra={
+            "method": request.method,
+            "path": request.url.path,
+            "client": request.client.host if request.client else "unknown"
+        })
 
     response = await call_next(request)
 
-    duration = time.time() - start_time
-    request_count.labels(
-        method=request.method,
-        endpoint=request.url.path,
-        status=response.status_code
-    ).inc()
-    request_duration.labels(
-        method=request.method,
-        endpoint=request.url.path
-    ).observe(duration)
-
-    log_info(f"Request completed: {request.method} {request.url.path} - {response.status_code}", extra={
-        "method": request.method,
-        "path": request.url.path,
-        "status_code": response.status_code,
-        "duration": duration
-    })
+    duration = time.perf_counter() - start_time
+    request_counter(request.method, request.url.path, response.status_code).inc()
+    request_timer(request.method, request.url.path).observe(duration)
+
+    if log_enabled:
+        log_info("Request completed: %s %s - %s", request.method, request.url.path, response.status_code, extra={
+            "method": request.method,
+            "path": request.url.path,
+            "status_code": response.status_code,
+            "duration": duration
+        })
 
     return response
 
@@ -128,25 +143,67 @@ if config.rate_limit_enabled:
     app.add_middleware(SlowAPIMiddleware)
     @app.exception_handler(RateLimitExceeded)
     async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
-        return JSONResponse(status_code=429, content={"detail": "Rate limit exceeded"})
+        return ORJSONResponse(status_code=429, content={"detail": "Rate limit exceeded"})
 
 # Global instances (lazy loaded)
 gemini_client: Optional[GeminiClient] = None
 transcription_engine: Optional[TranscriptionEngine] = None
+transcription_batcher: Optional[AsyncTranscriptionEngine] = None
+semantic_cache: Optional[SemanticCache] = None
 question_detector: QuestionDetector = QuestionDetector()
 context_manager: ContextManager = ContextManager()
 
 
 
+def initialize_semantic_cache():
+    """
+    Load and warm the semantic cache embedding model (once per process, if enabled).
+
+    The cache is optional: if the model cannot be loaded, answers are generated
+    without it.
+    """
+    global semantic_cache
+
+    if semantic_cache is None and config.semantic_cache_model:
+        log_info("🔄 Loading embedding model '%s'...", config.semantic_cache_model)
+        try:
+            if config.semantic_cache_model == "gemini":
+                embed = gemini_embedder(config.gemini_api_key)
+            else:
+                from sentence_transformers import SentenceTransformer
+
+                embedding_model = SentenceTransformer(config.semantic_cache_model)
+                embed = partial(embedding_model.encode, show_progress_bar=False)
+            cache = SemanticCache(embed=embed, threshold=config.semantic_cache_threshold)
+            cache.warmup()
+        except Exception as e:
+            log_error("❌ Semantic cache disabled, embedding model failed to load: %s", e)
+            return
+        semantic_cache = cache
+        log_info("✅ Semantic cache enabled (%s)", config.semantic_cache_model)
+
+
 def initialize_engines():
     """Initialize AI engines (lazy loading)."""
-    global gemini_client, transcription_engine
+    global gemini_client, transcription_engine, transcription_batcher
 
     if gemini_client is None:
         log_info("🔄 Initializing Gemini client...")
+        initialize_semantic_cache()
+        response_cache = LLMCache(
+            RedisCacheBackend(config.redis_url) if config.response_cache_storage == "redis" else None,
+            hash_algo=config.response_cache_hash_algo
+        )
         gemini_client = GeminiClient(
             api_key=config.gemini_api_key,
-            model=config.gemini_model
+            model=config.gemini_model,
+            semantic_cache=semantic_cache,
+            response_cache=response_cache,
+            enable_context_cache=config.gemini_context_cache,
+            rate_limiter=(
+                TokenBucket(config.gemini_requests_per_second, config.gemini_burst)
+                if config.gemini_requests_per_second > 0 else None
+            )
         )
         log_info("✅ Gemini client initialized")
 
@@ -154,8 +211,13 @@ def initialize_engines():
         log_info("🔄 Loading Whisper model...")
         transcription_engine = TranscriptionEngine(
             model_name=config.whisper_model,
-            language=config.whisper_language
+            language=config.whisper_language,
+            device=config.whisper_device,
+            compute_type=config.whisper_compute_type,
+            vad_filter=config.whisper_vad,
+            cpu_threads=config.whisper_cpu_threads
         )
+        transcription_batcher = AsyncTranscriptionEngine(transcription_engine)
         log_info("✅ Whisper model loaded")
 
 
@@ -181,7 +243,8 @@ class GenerateResponse(BaseModel):
     timestamp: str
 
 class ProcessAudioRequest(BaseModel):
-    audio: list = Field(..., max_items=1_000_000, description="Float32Array as list (max 1M samples ~60s)")
+    # Untyped list: items are not validated one by one, numpy converts them in a single pass
+    audio: list = Field(..., max_length=1_000_000, description="Float32Array as list (max 1M samples ~60s)")
     sampleRate: Optional[int] = Field(16000, ge=8000, le=48000)
 
 class ProcessAudioResponse(BaseModel):
@@ -228,10 +291,10 @@ async def root():
 
 @app.post("/api/auth/register", response_model=TokenResponse)
 @rate_limit()
-async def register(request: Request, user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(request: Request, user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """Register a new user."""
     try:
-        log_info(f"User registration attempt: {user_data.email}")
+        log_info("User registration attempt: %s", user_data.email)
 
         # Create user
         user = await create_user(user_data, db)
@@ -239,7 +302,7 @@ async def register(request: Request, user_data: UserCreate, db: Session = Depend
         # Create access token
         access_token = create_access_token(data={"sub": user.id})
 
-        log_info(f"User registered successfully: {user.email}")
+        log_info("User registered successfully: %s", user.email)
         return TokenResponse(
             access_token=access_token,
             token_type="bearer",
@@ -247,12 +310,12 @@ async def register(request: Request, user_data: UserCreate, db: Session = Depend
         )
 
     except HTTPException as e:
-        log_warning(f"Registration failed: {e.detail}", extra={"email": user_data.email})
-        error_count.labels(error_type="registration_failed", endpoint="/api/auth/register").inc()
+        log_warning("Registration failed: %s", e.detail, extra={"email": user_data.email})
+        error_counter("registration_failed", "/api/auth/register").inc()
         raise
     except Exception as e:
-        log_error(f"Registration error: {str(e)}", extra={"email": user_data.email})
-        error_count.labels(error_type="registration_error", endpoint="/api/auth/register").inc()
+        log_error("Registration error: %s", e, extra={"email": user_data.email})
+        error_counter("registration_error", "/api/auth/register").inc()
         raise HTTPException(status_code=500, detail=f"Registration error: {str(e)}")
 
 
@@ -262,23 +325,23 @@ class LoginRequest(BaseModel):
 
 @app.post("/api/auth/login", response_model=TokenResponse)
 @rate_limit()
-async def login(request: Request, login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(request: Request, login_data: LoginRequest, db: AsyncSession = Depends(get_db)):
     """Authenticate user and return JWT token."""
     try:
-        log_info(f"Login attempt: {login_data.username}")
+        log_info("Login attempt: %s", login_data.username)
 
         # Authenticate user
         user = await authenticate_user(login_data.username, login_data.password, db)
 
         if not user:
-            log_warning(f"Login failed: invalid credentials", extra={"email": login_data.username})
-            error_count.labels(error_type="login_failed", endpoint="/api/auth/login").inc()
+            log_warning("Login failed: invalid credentials", extra={"email": login_data.username})
+            error_counter("login_failed", "/api/auth/login").inc()
             raise HTTPException(status_code=401, detail="Incorrect email or password")
 
         # Create access token
         access_token = create_access_token(data={"sub": user.id})
 
-        log_info(f"Login successful: {login_data.username}")
+        log_info("Login successful: %s", login_data.username)
         return TokenResponse(
             access_token=access_token,
             token_type="bearer",
@@ -288,8 +351,8 @@ async def login(request: Request, login_data: LoginRequest, db: Session = Depend
     except HTTPException:
         raise
     except Exception as e:
-        log_error(f"Login error: {str(e)}", extra={"email": login_data.username})
-        error_count.labels(error_type="login_error", endpoint="/api/auth/login").inc()
+        log_error("Login error: %s", e, extra={"email": login_data.username})
+        error_counter("login_error", "/api/auth/login").inc()
         raise HTTPException(status_code=500, detail=f"Login error: {str(e)}")
 
 
@@ -298,14 +361,14 @@ async def login(request: Request, login_data: LoginRequest, db: Session = Depend
 async def get_current_user_info(
     request: Request, 
     current_user: TokenData = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get current user information."""
-    log_debug(f"User info requested: {current_user.user_id}")
+    log_debug("User info requested: %s", current_user.user_id)
 
     # Fetch full user from DB (SQLAlchemy 2.0 style)
     stmt = select(DBUser).where(DBUser.id == current_user.user_id)
-    user = db.execute(stmt).scalar_one_or_none()
+    user = (await db.execute(stmt)).scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -337,30 +400,30 @@ async def health_check(request: Request):
 
         # Check database connection if enabled
         try:
-            db_ok = check_db_connection()
+            db_ok = await check_db_connection()
         except Exception as e:
-            log_warning(f"Database health check failed: {e}")
+            log_warning("Database health check failed: %s", e)
             db_ok = False
 
         status = "healthy" if gemini_ok else "degraded"
 
-        log_debug(f"Health check: {status}")
+        log_debug("Health check: %s", status)
         return HealthResponse(
             status=status,
             version="2.0.0",
             gemini_model=config.gemini_model,
             whisper_model=config.whisper_model,
-            timestamp=datetime.utcnow().isoformat()
+            timestamp=datetime.now(timezone.utc).isoformat()
         )
     except Exception as e:
-        log_error(f"Health check error: {e}")
-        error_count.labels(error_type="health_check_error", endpoint="/api/health").inc()
+        log_error("Health check error: %s", e)
+        error_counter("health_check_error", "/api/health").inc()
         return HealthResponse(
             status="unhealthy",
             version="2.0.0",
             gemini_model=config.gemini_model,
             whisper_model=config.whisper_model,
-            timestamp=datetime.utcnow().isoformat()
+            timestamp=datetime.now(timezone.utc).isoformat()
         )
 
 
@@ -374,10 +437,10 @@ async def transcribe_audio(
     """Transcribe audio to text."""
     initialize_engines()
 
-    start_time = time.time()
+    start_time = time.perf_counter()
 
     try:
-        log_info(f"Transcription request received", extra={
+        log_info("Transcription request received", extra={
             "user_id": current_user.user_id if current_user else "anonymous",
             "language": transcribe_request.language
         })
@@ -387,30 +450,30 @@ async def transcribe_audio(
         audio_array = np.frombuffer(audio_bytes, dtype=np.float32)
 
         # Transcribe
-        text = transcription_engine.transcribe(audio_array)
+        text = await transcription_batcher.transcribe_async(audio_array)
 
         if not text:
             log_warning("Transcription failed: empty result")
-            error_count.labels(error_type="empty_transcription", endpoint="/api/transcribe").inc()
+            error_counter("empty_transcription", "/api/transcribe").inc()
             raise HTTPException(status_code=400, detail="Failed to transcribe audio")
 
         # Track metrics
         transcription_count.inc()
-        transcription_duration.observe(time.time() - start_time)
+        transcription_duration.observe(time.perf_counter() - start_time)
 
-        log_info(f"Transcription successful: {len(text)} characters")
+        log_info("Transcription successful: %s characters", len(text))
 
         return TranscribeResponse(
             text=text,
             language=transcribe_request.language,
-            timestamp=datetime.utcnow().isoformat()
+            timestamp=datetime.now(timezone.utc).isoformat()
         )
 
     except HTTPException:
         raise
     except Exception as e:
-        log_error(f"Transcription error: {str(e)}")
-        error_count.labels(error_type="transcription_error", endpoint="/api/transcribe").inc()
+        log_error("Transcription error: %s", e)
+        error_counter("transcription_error", "/api/transcribe").inc()
         raise HTTPException(status_code=500, detail=f"Transcription error: {str(e)}")
 
 
@@ -424,10 +487,10 @@ async def generate_answer(
     """Generate answer for a question."""
     initialize_engines()
 
-    start_time = time.time()
+    start_time = time.perf_counter()
 
     try:
-        log_info(f"Generation request received", extra={
+        log_info("Generation request received", extra={
             "user_id": current_user.user_id if current_user else "anonymous",
             "question_length": len(generate_request.question)
         })
@@ -450,60 +513,109 @@ async def generate_answer(
 
         if not answer:
             log_warning("Generation failed: empty result")
-            error_count.labels(error_type="empty_generation", endpoint="/api/generate").inc()
+            error_counter("empty_generation", "/api/generate").inc()
             raise HTTPException(status_code=500, detail="Failed to generate answer")
 
         # Track metrics
         generation_count.inc()
-        generation_duration.observe(time.time() - start_time)
+        generation_duration.observe(time.perf_counter() - start_time)
 
-        log_info(f"Generation successful: {len(answer)} characters")
+        log_info("Generation successful: %s characters", len(answer))
 
         return GenerateResponse(
             answer=answer,
-            timestamp=datetime.utcnow().isoformat()
+            timestamp=datetime.now(timezone.utc).isoformat()
         )
 
     except HTTPException:
         raise
     except Exception as e:
-        log_error(f"Generation error: {str(e)}")
-        error_count.labels(error_type="generation_error", endpoint="/api/generate").inc()
+        log_error("Generation error: %s", e)
+        error_counter("generation_error", "/api/generate").inc()
         raise HTTPException(status_code=500, detail=f"Generation error: {str(e)}")
 
 
+@app.post("/api/generate/stream")
+@rate_limit()
+async def generate_answer_stream(
+    request: Request,
+    generate_request: GenerateRequest,
+    current_user: Optional[TokenData] = Depends(get_optional_user)
+):
+    """Generate answer for a question, streamed as Server-Sent Events."""
+    initialize_engines()
+
+    log_info("Streaming generation request received", extra={
+        "user_id": current_user.user_id if current_user else "anonymous",
+        "question_length": len(generate_request.question)
+    })
+
+    # Build system prompt
+    system_prompt = context_manager.build_system_prompt(
+        cv=generate_request.context.get("cv", ""),
+        company=generate_request.context.get("company", ""),
+        position=generate_request.context.get("position", ""),
+        custom_system_prompt=generate_request.context.get("custom_system_prompt", "")
+    )
+
+    async def event_stream():
+        start_time = time.perf_counter()
+        try:
+            async for chunk in gemini_client.generate_response_stream_async(
+                system_prompt=system_prompt,
+                user_prompt=generate_request.question,
+                temperature=generate_request.temperature,
+                max_tokens=generate_request.max_tokens
+            ):
+                yield f"data: {orjson.dumps({'delta': chunk}).decode()}\n\n"
+        except Exception as e:
+            log_error("Streaming generation error: %s", e)
+            error_counter("generation_error", "/api/generate/stream").inc()
+            yield f"event: error\ndata: {orjson.dumps({'message': f'Generation error: {str(e)}'}).decode()}\n\n"
+            return
+
+        generation_count.inc()
+        generation_duration.observe(time.perf_counter() - start_time)
+        yield f"event: done\ndata: {orjson.dumps({'timestamp': datetime.now(timezone.utc).isoformat()}).decode()}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @app.post("/api/process_audio", response_model=ProcessAudioResponse)
 @rate_limit()
 async def process_audio(
     request: Request,
     audio_request: ProcessAudioRequest,
     current_user: Optional[TokenData] = Depends(get_optional_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Process audio: transcribe + detect question + generate answer."""
     initialize_engines()
 
-    start_time = time.time()
+    start_time = time.perf_counter()
     session_id = current_user.user_id if current_user else "anonymous"
 
     try:
         # Convert list to numpy array
-        audio_array = np.array(audio_request.audio, dtype=np.float32)
+        audio_array = np.asarray(audio_request.audio, dtype=np.float32)
 
         # Normalize if needed
         if audio_array.max() > 1.0:
             audio_array = audio_array / 32768.0
 
-        log_info(f"Processing audio: {len(audio_array)} samples", extra={
+        log_info("Processing audio: %s samples", len(audio_array), extra={
             "user_id": session_id,
             "sample_count": len(audio_array)
         })
 
-        # Transcribe
-        transcription_start = time.time()
-        text = transcription_engine.transcribe(audio_array)
+        # Transcribe and fetch context concurrently (the lookup does not depend on the text)
+        transcription_start = time.perf_counter()
+        text, context_data = await asyncio.gather(
+            transcription_batcher.transcribe_async(audio_array),
+            get_context_db(session_id, db)
+        )
         transcription_count.inc()
-        transcription_duration.observe(time.time() - transcription_start)
+        transcription_duration.observe(time.perf_counter() - transcription_start)
 
         if not text:
             log_debug("Empty transcription result")
@@ -513,7 +625,7 @@ async def process_audio(
                 answer=None
             )
 
-        log_info(f"Transcribed: {text[:100]}...", extra={
+        log_info("Transcribed: %s...", text[:100], extra={
             "user_id": session_id,
             "text_length": len(text)
         })
@@ -525,8 +637,7 @@ async def process_audio(
             log_info("Question detected!", extra={"user_id": session_id})
             question_detected_count.inc()
 
-            # Get context from database
-            context_data = get_context_db(session_id, db) or Context()
+            context_data = context_data or Context()
 
             # Build system prompt
             system_prompt = context_manager.build_system_prompt(
@@ -537,7 +648,7 @@ async def process_audio(
             )
 
             # Generate answer
-            generation_start = time.time()
+            generation_start = time.perf_counter()
             answer = await gemini_client.generate_response_async(
                 system_prompt=system_prompt,
                 user_prompt=text,
@@ -545,17 +656,17 @@ async def process_audio(
                 max_tokens=500
             )
             generation_count.inc()
-            generation_duration.observe(time.time() - generation_start)
+            generation_duration.observe(time.perf_counter() - generation_start)
 
             if answer:
-                log_info(f"Answer generated: {len(answer)} characters", extra={
+                log_info("Answer generated: %s characters", len(answer), extra={
                     "user_id": session_id,
                     "answer_length": len(answer)
                 })
 
                 # Save to history
-                timestamp = datetime.utcnow().isoformat()
-                add_history_entry(session_id, text, answer, db)
+                timestamp = datetime.now(timezone.utc).isoformat()
+                await add_history_entry(session_id, text, answer, db)
 
                 return ProcessAudioResponse(
                     success=True,
@@ -580,8 +691,8 @@ async def process_audio(
             )
 
     except Exception as e:
-        log_error(f"Error processing audio: {str(e)}", extra={"user_id": session_id})
-        error_count.labels(error_type="process_audio_error", endpoint="/api/process_audio").inc()
+        log_error("Error processing audio: %s", e, extra={"user_id": session_id})
+        error_counter("process_audio_error", "/api/process_audio").inc()
         raise HTTPException(status_code=500, detail=f"Processing error: {str(e)}")
 
 
@@ -590,15 +701,15 @@ async def process_audio(
 async def get_context(
     request: Request,
     current_user: Optional[TokenData] = Depends(get_optional_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get interview context."""
     session_id = current_user.user_id if current_user else "anonymous"
 
     # Get context from database
-    context_data = get_context_db(session_id, db) or Context()
+    context_data = await get_context_db(session_id, db) or Context()
 
-    log_debug(f"Context retrieved", extra={"user_id": session_id})
+    log_debug("Context retrieved", extra={"user_id": session_id})
 
     return ContextResponse(
         cv=context_data.cv,
@@ -614,7 +725,7 @@ async def update_context(
     request: Request,
     context_request: ContextRequest,
     current_user: Optional[TokenData] = Depends(get_optional_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update interview context."""
     session_id = current_user.user_id if current_user else "anonymous"
@@ -627,9 +738,9 @@ async def update_context(
     )
 
     # Update context in database
-    update_context_db(session_id, context_data, db)
+    await update_context_db(session_id, context_data, db)
 
-    log_info(f"Context updated: {context_request.company} - {context_request.position}", extra={
+    log_info("Context updated: %s - %s", context_request.company, context_request.position, extra={
         "user_id": session_id,
         "company": context_request.company,
         "position": context_request.position
@@ -643,15 +754,15 @@ async def update_context(
 async def get_history(
     request: Request,
     current_user: Optional[TokenData] = Depends(get_optional_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get interview history."""
     session_id = current_user.user_id if current_user else "anonymous"
 
     # Get history from database
-    history_data = get_history_db(session_id, db)
+    history_data = await get_history_db(session_id, db)
 
-    log_debug(f"History retrieved: {len(history_data)} entries", extra={
+    log_debug("History retrieved: %s entries", len(history_data), extra={
         "user_id": session_id,
         "entry_count": len(history_data)
     })
@@ -669,7 +780,7 @@ async def start_session(request: Request, current_user: Optional[TokenData] = De
     initialize_engines()
 
     session_id = current_user.user_id if current_user else "anonymous"
-    log_info(f"Session started", extra={"user_id": session_id})
+    log_info("Session started", extra={"user_id": session_id})
 
     return {
         "success": True,
@@ -682,7 +793,7 @@ async def start_session(request: Request, current_user: Optional[TokenData] = De
 async def stop_session(request: Request, current_user: Optional[TokenData] = Depends(get_optional_user)):
     """Stop interview session."""
     session_id = current_user.user_id if current_user else "anonymous"
-    log_info(f"Session stopped", extra={"user_id": session_id})
+    log_info("Session stopped", extra={"user_id": session_id})
 
     return {
         "success": True,
@@ -692,6 +803,11 @@ async def stop_session(request: Request, current_user: Optional[TokenData] = Dep
 
 # ============= WebSocket Endpoint =============
 
+async def send_json(websocket: WebSocket, payload: dict):
+    """Send a JSON message over WebSocket using orjson serialization."""
+    await websocket.send_text(orjson.dumps(payload).decode())
+
+
 @app.websocket("/ws/audio")
 async def websocket_audio_stream(websocket: WebSocket):
     """
@@ -713,7 +829,7 @@ async def websocket_audio_stream(websocket: WebSocket):
     # If auth is required and no valid token, close connection
     if config.require_auth and not user:
         log_warning("WebSocket connection rejected: authentication required")
-        await websocket.send_json({
+        await send_json(websocket, {
             "type": "error",
             "message": "Authentication required. Provide token as query parameter: ?token=YOUR_JWT_TOKEN"
         })
@@ -721,32 +837,32 @@ async def websocket_audio_stream(websocket: WebSocket):
         return
 
     session_id = user.user_id if user else "anonymous"
-    log_info(f"WebSocket connected: {session_id}")
+    log_info("WebSocket connected: %s", session_id)
 
     try:
         while True:
             # Receive audio data
             data = await websocket.receive_text()
-            message = json.loads(data)
+            message = orjson.loads(data)
 
             if message["type"] == "audio":
                 # Process audio chunk
                 audio_data = np.array(message["data"], dtype=np.float32)
 
                 # Transcribe
-                transcription_start = time.time()
-                text = transcription_engine.transcribe(audio_data)
+                transcription_start = time.perf_counter()
+                text = await transcription_batcher.transcribe_async(audio_data)
                 transcription_count.inc()
-                transcription_duration.observe(time.time() - transcription_start)
+                transcription_duration.observe(time.perf_counter() - transcription_start)
 
                 if text:
-                    log_debug(f"WebSocket transcription: {text[:50]}...", extra={
+                    log_debug("WebSocket transcription: %s...", text[:50], extra={
                         "user_id": session_id,
                         "text_length": len(text)
                     })
 
                     # Send transcription
-                    await websocket.send_json({
+                    await send_json(websocket, {
                         "type": "transcription",
                         "text": text
                     })
@@ -756,15 +872,14 @@ async def websocket_audio_stream(websocket: WebSocket):
                         question_detected_count.inc()
                         log_info("WebSocket question detected", extra={"user_id": session_id})
 
-                        await websocket.send_json({
+                        await send_json(websocket, {
                             "type": "question_detected",
                             "question": text
                         })
 
                         # Get context from DB
-                        db_ws = SessionLocal()
-                        context_data = get_context_db(session_id, db_ws) or Context()
-                        db_ws.close()
+                        async with SessionLocal() as db_ws:
+                            context_data = await get_context_db(session_id, db_ws) or Context()
                         system_prompt = context_manager.build_system_prompt(
                             cv=context_data.cv,
                             company=context_data.company,
@@ -773,46 +888,54 @@ async def websocket_audio_stream(websocket: WebSocket):
                         )
 
                         # Generate answer (stream chunks)
-                        generation_start = time.time()
+                        generation_start = time.perf_counter()
                         answer_chunks = []
-                        for chunk in gemini_client.stream_response(
-                            system_prompt=system_prompt,
-                            user_prompt=text,
-                            temperature=0.7,
-                            max_tokens=500
-                        ):
-                            if chunk.strip():
-                                answer_chunks.append(chunk)
-                                await websocket.send_json({
-                                    "type": "answer_chunk",
-                                    "delta": chunk
-                                })
+                        try:
+                            async for chunk in gemini_client.generate_response_stream_async(
+                                system_prompt=system_prompt,
+                                user_prompt=text,
+                                temperature=0.7,
+                                max_tokens=500
+                            ):
+                                if chunk.strip():
+                                    answer_chunks.append(chunk)
+                                    await send_json(websocket, {
+                                        "type": "answer_chunk",
+                                        "delta": chunk
+                                    })
+                        except Exception as e:
+                            log_error("WebSocket generation error: %s", e, extra={"user_id": session_id})
+                            error_counter("generation_error", "/ws/audio").inc()
+                            await send_json(websocket, {
+                                "type": "error",
+                                "message": f"Generation error: {str(e)}"
+                            })
+                            continue
                         generation_count.inc()
-                        generation_duration.observe(time.time() - generation_start)
+                        generation_duration.observe(time.perf_counter() - generation_start)
                         full_answer = "".join(answer_chunks).strip()
 
                         if full_answer:
-                            log_info(f"WebSocket streamed answer generated: {len(full_answer)} characters", extra={
+                            log_info("WebSocket streamed answer generated: %s characters", len(full_answer), extra={
                                 "user_id": session_id
                             })
-                            await websocket.send_json({
+                            await send_json(websocket, {
                                 "type": "answer_final",
                                 "answer": full_answer
                             })
 
             elif message["type"] == "ping":
-                await websocket.send_json({"type": "pong"})
+                await send_json(websocket, {"type": "pong"})
             elif message["type"] == "context":
                 # Update context via DB
                 data = message["data"]
-                db_ws = SessionLocal()
-                update_context_db(session_id, Context(
-                    cv=data.get("cv", ""),
-                    company=data.get("company", ""),
-                    position=data.get("position", ""),
-                    custom_system_prompt=data.get("custom_system_prompt", "")
-                ), db_ws)
-                db_ws.close()
+                async with SessionLocal() as db_ws:
+                    await update_context_db(session_id, Context(
+                        cv=data.get("cv", ""),
+                        company=data.get("company", ""),
+                        position=data.get("position", ""),
+                        custom_system_prompt=data.get("custom_system_prompt", "")
+                    ), db_ws)
 
                 log_info("WebSocket context updated", extra={
                     "user_id": session_id,
@@ -820,7 +943,7 @@ async def websocket_audio_stream(websocket: WebSocket):
                     "position": context_data.get("position", "")
                 })
 
-                await websocket.send_json({
+                await send_json(websocket, {
                     "type": "status",
                     "message": "Context updated"
                 })
@@ -828,8 +951,8 @@ async def websocket_audio_stream(websocket: WebSocket):
     except WebSocketDisconnect:
         log_info("WebSocket disconnected", extra={"user_id": session_id})
     except Exception as e:
-        log_error(f"WebSocket error: {str(e)}", extra={"user_id": session_id})
-        error_count.labels(error_type="websocket_error", endpoint="/ws/audio").inc()
+        log_error("WebSocket error: %s", e, extra={"user_id": session_id})
+        error_counter("websocket_error", "/ws/audio").inc()
         await websocket.close()
 
 
@@ -841,28 +964,32 @@ async def startup_event():
     log_info("=" * 60)
     log_info("API SERVER STARTED")
     log_info("=" * 60)
-    log_info(f"Version: 2.0.0")
-    log_info(f"Gemini Model: {config.gemini_model}")
-    log_info(f"Whisper Model: {config.whisper_model}")
-    log_info(f"Auth Required: {config.require_auth}")
-    log_info(f"Rate Limiting: {config.rate_limit_enabled}")
-    log_info(f"Database: enabled")
+    log_info("Version: 2.0.0")
+    log_info("Gemini Model: %s", config.gemini_model)
+    log_info("Whisper Model: %s", config.whisper_model)
+    log_info("Auth Required: %s", config.require_auth)
+    log_info("Rate Limiting: %s", config.rate_limit_enabled)
+    log_info("Database: enabled")
     log_info("=" * 60)
 
     # Validate config
     if not config.validate():
         log_warning("⚠️  WARNING: Configuration validation failed!")
 
+    # Load the embedding model now so the first cacheable request does not pay for it
+    if config.semantic_cache_model:
+        await asyncio.to_thread(initialize_semantic_cache)
+
     # Initialize database if enabled
     try:
         log_info("Initializing database...")
-        init_db()
-        if check_db_connection():
+        await init_db()
+        if await check_db_connection():
             log_info("✅ Database connected successfully")
         else:
             log_error("❌ Database connection failed")
     except Exception as e:
-        log_error(f"❌ Database initialization error: {str(e)}")
+        log_error("❌ Database initialization error: %s", e)
 
 
 @app.on_event("shutdown")
@@ -870,13 +997,26 @@ async def shutdown_event():
     """Run on application shutdown."""
     log_info("Shutting down API...")
 
+    if gemini_client is not None:
+        await gemini_client.aclose()
+    if transcription_batcher is not None:
+        await transcription_batcher.aclose()
+
 
 if __name__ == "__main__":
+    import os
     import uvicorn
-    
+
+    # Note: in-process state (in-memory users, memory rate limiter) is per worker;
+    # use the database and RATE_LIMIT_STORAGE=redis when running more than one worker.
+    workers = 1 if config.api_debug else (config.api_workers or os.cpu_count())
+
     uvicorn.run(
         "app:app",
         host=config.api_host,
         port=config.api_port,
-        reload=config.api_debug
+        reload=config.api_debug,
+        workers=workers,
+        loop="uvloop",
+        http="httptools"
     )
@@ -1,27 +1,68 @@
 """JWT Authentication module for Interview Copilot API."""
 
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional, Dict
-from jose import JWTError, jwt
+from typing import Optional, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import itertools
+import os
+import threading
+import time
+import jwt
+import orjson
+from jwt.api_jwt import PyJWT
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel, EmailStr
-from sqlalchemy.orm import Session
+from pydantic import BaseModel, ConfigDict, EmailStr
+from sqlalchemy.ext.asyncio import AsyncSession
 from config import config
 
-# Password hashing
-pwd_context = CryptContext(schemes=["argon2", "bcrypt"], deprecated="auto")
+# Password hashing: Argon2id via argon2-cffi directly (no passlib dispatch on the hot path)
+password_hasher = PasswordHasher(
+    time_cost=config.argon2_time_cost,
+    memory_cost=config.argon2_memory_cost,
+    parallelism=config.argon2_parallelism
+)
+
+# Legacy bcrypt hashes are only verified, then re-hashed with Argon2id on login
+pwd_context = CryptContext(schemes=["bcrypt"])
 
 # Bearer token security
 security = HTTPBearer()
 
+# JWT settings are immutable after startup; bind them once for the hot decode path
+_SECRET = config.jwt_secret_key
+_ALG = config.jwt_algorithm
+_ALGORITHMS = [_ALG]
+_TTL_SECONDS = config.jwt_access_token_expire_minutes * 60
+
+
+class _OrjsonJWT(PyJWT):
+    """PyJWT decoder that parses the token payload with orjson."""
+
+    def _decode_payload(self, decoded: dict) -> dict:
+        try:
+            payload = orjson.loads(decoded["payload"])
+        except ValueError as e:
+            raise jwt.DecodeError(f"Invalid payload string: {e}") from e
+        if not isinstance(payload, dict):
+            raise jwt.DecodeError("Invalid payload string: must be a json object")
+        return payload
+
+
+_jwt = _OrjsonJWT()
+
 
-class TokenData(BaseModel):
-    """JWT Token data model."""
+@dataclass(slots=True, frozen=True)
+class TokenData:
+    """JWT Token data (internal DTO built from verified claims, no validation needed)."""
     user_id: str
     email: Optional[str] = None
-    exp: Optional[datetime] = None
+    exp: Optional[int] = None
 
 
 class UserCredentials(BaseModel):
@@ -38,7 +79,9 @@ class UserCreate(BaseModel):
 
 
 class User(BaseModel):
-    """User model."""
+    """User model (built with model_construct from trusted storage, skipping validation)."""
+    model_config = ConfigDict(frozen=True)
+
     id: str
     email: str
     full_name: Optional[str] = None
@@ -55,37 +98,188 @@ class TokenResponse(BaseModel):
 
 # In-memory user storage (replace with database in production)
 users_db: Dict[str, Dict] = {}
+users_by_id: Dict[str, Dict] = {}  # Same user dicts, indexed by user ID
+_user_ids = itertools.count(1)
+
+# Shared user storage for multi-worker deployments (USER_STORAGE=redis).
+# Users live in hashes "user:{email}", with "user_id:{id}" -> email as the ID index.
+redis_client = None
+
+if config.user_storage == "redis":
+    import redis.asyncio as redis
+
+    redis_client = redis.from_url(config.redis_url, decode_responses=True)
+
+
+def _user_to_redis(user_dict: Dict) -> Dict[str, str]:
+    """Serialize user dict to Redis hash fields."""
+    return {
+        "id": user_dict["id"],
+        "email": user_dict["email"],
+        "hashed_password": user_dict["hashed_password"],
+        "full_name": user_dict["full_name"] or "",
+        "is_active": "1" if user_dict["is_active"] else "0",
+        "created_at": user_dict["created_at"].isoformat()
+    }
+
+
+def _user_from_redis(data: Dict[str, str]) -> Optional[Dict]:
+    """Deserialize Redis hash fields to user dict."""
+    if not data:
+        return None
+
+    return {
+        "id": data["id"],
+        "email": data["email"],
+        "hashed_password": data["hashed_password"],
+        "full_name": data["full_name"] or None,
+        "is_active": data["is_active"] == "1",
+        "created_at": datetime.fromisoformat(data["created_at"])
+    }
+
+
+async def _load_user(email: str) -> Optional[Dict]:
+    """Get stored user by email."""
+    if redis_client is not None:
+        return _user_from_redis(await redis_client.hgetall(f"user:{email}"))
+    return users_db.get(email)
+
+
+async def _load_user_by_id(user_id: str) -> Optional[Dict]:
+    """Get stored user by ID."""
+    if redis_client is not None:
+        email = await redis_client.get(f"user_id:{user_id}")
+        return await _load_user(email) if email else None
+    return users_by_id.get(user_id)
+
+
+async def _next_user_id() -> str:
+    """Allocate a new user ID."""
+    if redis_client is not None:
+        return f"user_{await redis_client.incr('user:next_id')}"
+    # next() runs without awaiting, so concurrent registrations never share an ID
+    return f"user_{next(_user_ids)}"
+
+
+async def _store_user(user_dict: Dict) -> bool:
+    """Store new user. Returns False if the email is already registered."""
+    email = user_dict["email"]
+
+    if redis_client is not None:
+        from redis.exceptions import WatchError
+
+        key = f"user:{email}"
+        # Hash and ID index are written in one transaction, only if the email is
+        # still free; a concurrent registration of the same email aborts it
+        async with redis_client.pipeline() as pipe:
+            try:
+                await pipe.watch(key)
+                if await pipe.exists(key):
+                    return False
+                pipe.multi()
+                pipe.hset(key, mapping=_user_to_redis(user_dict))
+                pipe.set(f"user_id:{user_dict['id']}", email)
+                await pipe.execute()
+            except WatchError:
+                return False
+        return True
+
+    if email in users_db:
+        return False
+    users_db[email] = user_dict
+    users_by_id[user_dict["id"]] = user_dict
+    return True
+
+
+async def _update_password_hash(user_dict: Dict, hashed_password: str):
+    """Replace stored password hash for user."""
+    user_dict["hashed_password"] = hashed_password
+    if redis_client is not None:
+        await redis_client.hset(f"user:{user_dict['email']}", "hashed_password", hashed_password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify password against hash."""
+    if hashed_password.startswith("$argon2"):
+        try:
+            return password_hasher.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
+
     return pwd_context.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Hash password."""
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check if hash is legacy (non-Argon2) or uses outdated Argon2 parameters."""
+    if not hashed_password.startswith("$argon2"):
+        return True
+    return password_hasher.check_needs_rehash(hashed_password)
+
+
+# Password hashing is deliberately slow CPU work; run it off the event loop.
+# argon2-cffi and bcrypt release the GIL, so the pool hashes in parallel.
+_HASH_POOL = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="password-hash")
+
+
+# Verified against when the email is unknown, so that path costs the same hash work
+# as a wrong password and does not reveal whether the account exists
+_DUMMY_HASH = get_password_hash("\x00" * 16)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify password against hash in the hashing thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_HASH_POOL, verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash password in the hashing thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_HASH_POOL, get_password_hash, password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token."""
     to_encode = data.copy()
 
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=config.jwt_access_token_expire_minutes)
-
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, config.jwt_secret_key, algorithm=config.jwt_algorithm)
+    # RFC 7519 NumericDate: integer epoch seconds
+    ttl_seconds = int(expires_delta.total_seconds()) if expires_delta else _TTL_SECONDS
+    to_encode["exp"] = int(time.time()) + ttl_seconds
+    encoded_jwt = jwt.encode(to_encode, _SECRET, algorithm=_ALG)
 
     return encoded_jwt
 
 
+# Successfully decoded tokens: raw token -> (TokenData, exp timestamp).
+# Invalid tokens are never cached, so they are always re-verified.
+TOKEN_CACHE_MAX_SIZE = 10_000
+_token_cache: Dict[str, Tuple[TokenData, float]] = {}
+_token_cache_lock = threading.Lock()
+
+
+def _cache_token(token: str, token_data: TokenData, exp: float):
+    """Store decoded token until its expiry, evicting the oldest entry when full."""
+    with _token_cache_lock:
+        if len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+            _token_cache.pop(next(iter(_token_cache)), None)
+        _token_cache[token] = (token_data, exp)
+
+
 def decode_token(token: str) -> TokenData:
     """Decode and validate JWT token."""
+    cached = _token_cache.get(token)
+    if cached is not None:
+        if cached[1] > time.time():
+            return cached[0]
+        _token_cache.pop(token, None)
+
     try:
-        payload = jwt.decode(token, config.jwt_secret_key, algorithms=[config.jwt_algorithm])
+        payload = _jwt.decode(token, _SECRET, algorithms=_ALGORITHMS)
         user_id: str = payload.get("sub")
         email = payload.get("email")
 
@@ -96,9 +290,15 @@ def decode_token(token: str) -> TokenData:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        return TokenData(user_id=user_id, email=email)
+        exp = payload.get("exp")
+        token_data = TokenData(user_id=user_id, email=email, exp=exp)
 
-    except JWTError:
+        if exp is not None:
+            _cache_token(token, token_data, exp)
+
+        return token_data
+
+    except jwt.InvalidTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
@@ -114,13 +314,10 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
 
 async def get_optional_user(authorization: Optional[str] = Header(None)) -> Optional[TokenData]:
     """Get user if token provided, otherwise None (for optional auth)."""
-    if not authorization:
+    if not authorization or len(authorization) < 8 or authorization[:7] != "Bearer ":
         return None
 
-    if not authorization.startswith("Bearer "):
-        return None
-
-    token = authorization.replace("Bearer ", "")
+    token = authorization[7:]
 
     try:
         return decode_token(token)
@@ -147,7 +344,7 @@ async def get_websocket_user(token: Optional[str] = None) -> Optional[TokenData]
         return None
 
 
-async def create_user(user_data: UserCreate, db: Optional[Session] = None) -> User:
+async def create_user(user_data: UserCreate, db: Optional[AsyncSession] = None) -> User:
     """
     Create new user.
 
@@ -171,7 +368,7 @@ async def create_user(user_data: UserCreate, db: Optional[Session] = None) -> Us
         from db_operations import create_user_db, get_user_by_email
 
         # Check if user exists
-        existing_user = get_user_by_email(db, email)
+        existing_user = await get_user_by_email(db, email)
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -180,11 +377,11 @@ async def create_user(user_data: UserCreate, db: Optional[Session] = None) -> Us
 
         # Create user in database
         user_id = f"user_{datetime.utcnow().timestamp()}"
-        hashed_password = get_password_hash(password)
+        hashed_password = await get_password_hash_async(password)
 
-        db_user = create_user_db(db, user_id, email, hashed_password, full_name)
+        db_user = await create_user_db(db, user_id, email, hashed_password, full_name)
 
-        return User(
+        return User.model_construct(
             id=db_user.id,
             email=db_user.email,
             full_name=db_user.full_name,
@@ -192,16 +389,16 @@ async def create_user(user_data: UserCreate, db: Optional[Session] = None) -> Us
             created_at=db_user.created_at
         )
 
-    # Fallback to in-memory storage
+    # Fallback to in-memory (or Redis) storage
     else:
-        if email in users_db:
+        if await _load_user(email) is not None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
 
-        user_id = f"user_{len(users_db) + 1}"
-        hashed_password = get_password_hash(password)
+        user_id = await _next_user_id()
+        hashed_password = await get_password_hash_async(password)
 
         user_dict = {
             "id": user_id,
@@ -212,9 +409,13 @@ async def create_user(user_data: UserCreate, db: Optional[Session] = None) -> Us
             "created_at": datetime.utcnow()
         }
 
-        users_db[email] = user_dict
+        if not await _store_user(user_dict):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered"
+            )
 
-        return User(
+        return User.model_construct(
             id=user_id,
             email=email,
             full_name=full_name,
@@ -223,7 +424,7 @@ async def create_user(user_data: UserCreate, db: Optional[Session] = None) -> Us
         )
 
 
-async def authenticate_user(email: str, password: str, db: Optional[Session] = None) -> Optional[User]:
+async def authenticate_user(email: str, password: str, db: Optional[AsyncSession] = None) -> Optional[User]:
     """
     Authenticate user with email and password.
 
@@ -240,15 +441,21 @@ async def authenticate_user(email: str, password: str, db: Optional[Session] = N
         # Import here to avoid circular dependency
         from db_operations import get_user_by_email
 
-        db_user = get_user_by_email(db, email)
+        db_user = await get_user_by_email(db, email)
 
         if not db_user:
+            await verify_password_async(password, _DUMMY_HASH)
             return None
 
-        if not verify_password(password, db_user.hashed_password):
+        if not await verify_password_async(password, db_user.hashed_password):
             return None
 
-        return User(
+        # Upgrade legacy (bcrypt) or outdated hashes
+        if password_needs_rehash(db_user.hashed_password):
+            db_user.hashed_password = await get_password_hash_async(password)
+            await db.commit()
+
+        return User.model_construct(
             id=db_user.id,
             email=db_user.email,
             full_name=db_user.full_name,
@@ -256,17 +463,22 @@ async def authenticate_user(email: str, password: str, db: Optional[Session] = N
             created_at=db_user.created_at
         )
 
-    # Fallback to in-memory storage
+    # Fallback to in-memory (or Redis) storage
     else:
-        user_data = users_db.get(email)
+        user_data = await _load_user(email)
 
         if not user_data:
+            await verify_password_async(password, _DUMMY_HASH)
             return None
 
-        if not verify_password(password, user_data["hashed_password"]):
+        if not await verify_password_async(password, user_data["hashed_password"]):
             return None
 
-        return User(
+        # Upgrade legacy (bcrypt) or outdated hashes
+        if password_needs_rehash(user_data["hashed_password"]):
+            await _update_password_hash(user_data, await get_password_hash_async(password))
+
+        return User.model_construct(
             id=user_data["id"],
             email=user_data["email"],
             full_name=user_data.get("full_name"),
@@ -275,22 +487,25 @@ async def authenticate_user(email: str, password: str, db: Optional[Session] = N
         )
 
 
-def get_user_by_id(user_id: str) -> Optional[User]:
+async def get_user_by_id(user_id: str) -> Optional[User]:
     """Get user by ID."""
-    for user_data in users_db.values():
-        if user_data["id"] == user_id:
-            return User(
-                id=user_data["id"],
-                email=user_data["email"],
-                full_name=user_data.get("full_name"),
-                is_active=user_data["is_active"],
-                created_at=user_data["created_at"]
-            )
-    return None
+    user_data = await _load_user_by_id(user_id)
+    if user_data is None:
+        return None
+
+    return User.model_construct(
+        id=user_data["id"],
+        email=user_data["email"],
+        full_name=user_data.get("full_name"),
+        is_active=user_data["is_active"],
+        created_at=user_data["created_at"]
+    )
+
+
+# Config is immutable after startup, so the auth dependency is chosen once
+_AUTH_DEP = Depends(get_current_user) if config.require_auth else Depends(get_optional_user)
 
 
 def require_auth_dependency():
     """Dependency that requires authentication if REQUIRE_AUTH is True."""
-    if config.require_auth:
-        return Depends(get_current_user)
-    return Depends(get_optional_user)
+    return _AUTH_DEP
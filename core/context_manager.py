@@ -1,25 +1,10 @@
 """Context management for building prompts."""
 
-from models import Context
-
-
-class ContextManager:
-    """Manages interview context and builds system prompts."""
-    
-    def __init__(self, context: Context = None):
-        self.context = context or Context()
+from functools import lru_cache
 
-    def build_system_prompt(self, cv: str = "", company: str = "", position: str = "", custom_system_prompt: str = "") -> str:
-        """Build system prompt for LLM based on provided values or stored context."""
-        # Check if custom prompt is provided
-        custom_prompt = custom_system_prompt or getattr(self.context, "custom_system_prompt", "")
+from models import Context
 
-        if custom_prompt:
-            # User provided custom system prompt - use it as base
-            prompt = custom_prompt
-        else:
-            # Use default prompt
-            prompt = """Jesteś ekspertem od rozmów rekrutacyjnych.
+_DEFAULT_HEADER = """Jesteś ekspertem od rozmów rekrutacyjnych.
 
 ZASADY:
 - 2-4 zdania (zwięźle!)
@@ -28,16 +13,41 @@ ZASADY:
 - Po polsku
 """
 
-        # Add context information
-        cv_val = cv or self.context.cv
-        company_val = company or getattr(self.context, "company", "")
-        position_val = position or self.context.position
 
-        if cv_val:
-            prompt += f"\n\nTWOJE CV:\n{cv_val}\n"
-        if company_val:
-            prompt += f"\nFIRMA: {company_val}\n"
-        if position_val:
-            prompt += f"\nSTANOWISKO: {position_val}\n"
+@lru_cache(maxsize=128)
+def build_system_prompt(cv: str, company: str, position: str, custom_prompt: str) -> str:
+    """Build system prompt from resolved context values (memoized)."""
+    # Custom prompt replaces the default header when provided
+    parts = [custom_prompt or _DEFAULT_HEADER]
+
+    if cv:
+        parts.append(f"\n\nTWOJE CV:\n{cv}\n")
+    if company:
+        parts.append(f"\nFIRMA: {company}\n")
+    if position:
+        parts.append(f"\nSTANOWISKO: {position}\n")
+
+    return "".join(parts)
+
+
+# Prompt used when neither the call nor the stored context provides any values
+_EMPTY_DEFAULT_PROMPT = build_system_prompt("", "", "", "")
+
+
+class ContextManager:
+    """Manages interview context and builds system prompts."""
+
+    def __init__(self, context: Context = None):
+        self.context = context or Context()
+
+    def build_system_prompt(self, cv: str = "", company: str = "", position: str = "", custom_system_prompt: str = "") -> str:
+        """Build system prompt for LLM based on provided values or stored context."""
+        cv = cv or self.context.cv
+        company = company or getattr(self.context, "company", "")
+        position = position or self.context.position
+        custom_system_prompt = custom_system_prompt or getattr(self.context, "custom_system_prompt", "")
+
+        if not (cv or company or position or custom_system_prompt):
+            return _EMPTY_DEFAULT_PROMPT
 
-        return prompt
+        return build_system_prompt(cv, company, position, custom_system_prompt)
@@ -1,31 +1,191 @@
 """Gemini AI client for generating responses."""
 
 import google.generativeai as genai
-from typing import Optional
+from google.generativeai import client as genai_client
+from collections import OrderedDict
+from functools import lru_cache
+from typing import AsyncIterator, Callable, List, Optional
 import asyncio
-from functools import partial
+import hashlib
+import random
+import threading
+import time
+import warnings
+
+import aiohttp
+import numpy as np
+import orjson
+
+from core.gemini_client_cache import LLMCache
+from core.token_bucket import TokenBucket
+from core.semantic_cache import SemanticCache
+from metrics import time_to_first_token
 
 
 # Supported Gemini models
-SUPPORTED_MODELS = [
+SUPPORTED_MODELS: frozenset[str] = frozenset({
     "gemini-2.5-pro-exp-03-25",  # Gemini 2.5 Pro (Experimental, March 2025)
     "gemini-2.0-flash-exp",       # Gemini 2.0 Flash (Experimental)
     "gemini-1.5-pro",             # Gemini 1.5 Pro (Stable)
     "gemini-1.5-flash",           # Gemini 1.5 Flash (Stable)
     "gemini-pro",                 # Legacy Gemini Pro
-]
+})
+
+# REST endpoints used for async generation
+GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+GEMINI_STREAM_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:streamGenerateContent?alt=sse"
+GEMINI_CACHE_URL = "https://generativelanguage.googleapis.com/v1beta/cachedContents"
+GEMINI_REQUEST_TIMEOUT_SECONDS = 60
+
+# Server-side context caching of the system prompt. The API rejects caches below a
+# model-specific minimum size; tokens are estimated as ~4 characters each.
+CONTEXT_CACHE_MIN_TOKENS = 1024
+CONTEXT_CACHE_TTL_SECONDS = 3600
+# Wait before retrying a failed cache creation (prompt is sent inline meanwhile)
+CONTEXT_CACHE_RETRY_SECONDS = 60
+# Most system prompts whose cache names are remembered per client (least recently used dropped)
+CONTEXT_CACHE_MAX_ENTRIES = 64
+# generateContent statuses for a cachedContent the server no longer has
+STALE_CONTEXT_CACHE_STATUSES = frozenset({400, 404})
+
+# Upper bound on concurrent generateContent requests from this process
+MAX_CONCURRENT_REQUESTS = 64
+_request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+# Throttled/overloaded requests are retried with exponential backoff and jitter
+RETRYABLE_STATUSES = frozenset({429, 503})
+MAX_ATTEMPTS = 3
+MAX_RETRY_DELAY_SECONDS = 30
+
+# GenerativeModel instances kept per (model, sha256(system prompt)), shared by all
+# clients in the process (streaming paths)
+MODEL_CACHE_MAX_SIZE = 16
+_model_cache: "OrderedDict[tuple[str, str], genai.GenerativeModel]" = OrderedDict()
+_model_cache_lock = threading.Lock()
+
+# Answers are only reused for near-deterministic generations
+SEMANTIC_CACHE_MAX_TEMPERATURE = 0.3
+
+# Gemini embedding model usable as SemanticCache embedder (768-d)
+GEMINI_EMBEDDING_MODEL = "models/text-embedding-004"
+
+# API key the SDK is currently configured with. genai.configure() drops the SDK's
+# cached gRPC clients, so it is only called again when the key actually changes.
+_configured_api_key: Optional[str] = None
+_configure_lock = threading.Lock()
+
+
+def _configure(api_key: str):
+    """Configure the SDK with api_key (no-op if it already is)."""
+    global _configured_api_key
+    with _configure_lock:
+        if _configured_api_key != api_key:
+            genai.configure(api_key=api_key)
+            _configured_api_key = api_key
+
+
+def _retry_delay(attempt: int, retry_after: Optional[str]) -> float:
+    """Seconds to wait before retry `attempt + 1` (server's Retry-After wins)."""
+    if retry_after is not None:
+        try:
+            return min(MAX_RETRY_DELAY_SECONDS, float(retry_after))
+        except ValueError:
+            pass
+    return min(MAX_RETRY_DELAY_SECONDS, 2 ** attempt) + random.uniform(0, 1)
+
+
+async def _error_body(response: aiohttp.ClientResponse) -> dict:
+    """Parse an error response; non-JSON bodies (HTML pages, empty) give {}."""
+    try:
+        data = await response.json(content_type=None)
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def gemini_embedder(api_key: str, model: str = GEMINI_EMBEDDING_MODEL) -> Callable[[List[str]], np.ndarray]:
+    """
+    Build a SemanticCache embedder backed by the Gemini embedding API.
+
+    Args:
+        api_key: Google API key
+        model: Embedding model name
+
+    Returns:
+        Blocking function returning one embedding row per text
+    """
+    _configure(api_key)
+
+    def embed(texts: List[str]) -> np.ndarray:
+        result = genai.embed_content(model=model, content=texts, task_type="semantic_similarity")
+        return np.asarray(result["embedding"], dtype=np.float32)
+
+    return embed
+
+
+def _context_cache_key(system_prompt: str) -> str:
+    """Key of a system prompt in the context cache registry."""
+    return hashlib.sha256(system_prompt.encode()).hexdigest()
+
+
+def _build_payload(
+    system_prompt: str,
+    user_prompt: str,
+    temperature: float,
+    max_tokens: int,
+    cached_content: Optional[str] = None
+) -> dict:
+    """Build generateContent request body (system prompt inline or from a context cache)."""
+    payload = {
+        "contents": [{"role": "user", "parts": [{"text": user_prompt}]}],
+        "generationConfig": {
+            "temperature": temperature,
+            "maxOutputTokens": max_tokens,
+            "topP": 0.95,
+            "topK": 40,
+        },
+    }
+    if cached_content is not None:
+        payload["cachedContent"] = cached_content
+    else:
+        payload["system_instruction"] = {"parts": [{"text": system_prompt}]}
+    return payload
+
+
+@lru_cache(maxsize=64)
+def _generation_config(temperature: float, max_tokens: int) -> genai.types.GenerationConfig:
+    """Get SDK generation config (shared, never mutated)."""
+    return genai.types.GenerationConfig(
+        temperature=temperature,
+        max_output_tokens=max_tokens,
+        top_p=0.95,
+        top_k=40,
+    )
 
 
 class GeminiClient:
     """Client for Google Gemini API with native system instruction support."""
 
-    def __init__(self, api_key: str, model: str = "gemini-2.5-pro-exp-03-25"):
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gemini-2.5-pro-exp-03-25",
+        semantic_cache: Optional[SemanticCache] = None,
+        response_cache: Optional[LLMCache] = None,
+        enable_context_cache: bool = True,
+        rate_limiter: Optional[TokenBucket] = None
+    ):
         """
         Initialize Gemini client.
 
         Args:
             api_key: Google API key
             model: Gemini model name
+            semantic_cache: Optional cache returning answers for similar prompts
+            response_cache: Exact-match cache for temperature == 0 (defaults to in-memory)
+            enable_context_cache: Store large system prompts server-side (cachedContents)
+                and reference them instead of resending them with every request
+            rate_limiter: Optional client-side limit on generateContent requests
 
         Raises:
             ValueError: If API key is missing
@@ -35,15 +195,143 @@ class GeminiClient:
 
         # Validate model
         if model not in SUPPORTED_MODELS:
-            print(f"⚠️  WARNING: Model '{model}' is not in the supported models list.")
-            print(f"   Supported models: {', '.join(SUPPORTED_MODELS)}")
-            print(f"   Continuing anyway, but API calls may fail.")
+            warnings.warn(
+                f"Model '{model}' is not in the supported models list "
+                f"({', '.join(sorted(SUPPORTED_MODELS))}); API calls may fail.",
+                stacklevel=2
+            )
+
+        _configure(api_key)
 
-        genai.configure(api_key=api_key)
         self.model_name = model
         self.api_key = api_key
+        self.semantic_cache = semantic_cache
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Identical requests currently waiting on the API (single-flight)
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.response_cache = response_cache if response_cache is not None else LLMCache()
+        self.enable_context_cache = enable_context_cache
+        # sha256(system prompt) -> (cachedContents/<id> or None if creation failed, expires_at)
+        self._context_caches: "OrderedDict[str, tuple[Optional[str], float]]" = OrderedDict()
+        self._context_cache_locks: dict[str, asyncio.Lock] = {}
+        self.rate_limiter = rate_limiter
         print(f"✅ Gemini client initialized with model: {model}")
     
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get HTTP session, creating it on first use inside the running loop."""
+        if self._session is None or self._session.closed:
+            # Keep TLS connections to the API open between calls instead of re-handshaking
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=MAX_CONCURRENT_REQUESTS,
+                ttl_dns_cache=300,
+                keepalive_timeout=75
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=GEMINI_REQUEST_TIMEOUT_SECONDS)
+            )
+        return self._session
+
+    async def aclose(self):
+        """Close the HTTP session and the SDK's shared gRPC channels (call once on shutdown)."""
+        if self._session is not None:
+            await self._session.close()
+        if self.semantic_cache is not None:
+            await self.semantic_cache.aclose()
+        await genai_client.get_default_generative_async_client().transport.close()
+        genai_client.get_default_generative_client().transport.close()
+
+    def _get_model(self, system_prompt: str) -> genai.GenerativeModel:
+        """Get GenerativeModel for a system prompt, reusing recent instances across clients."""
+        key = (self.model_name, hashlib.sha256(system_prompt.encode()).hexdigest())
+        with _model_cache_lock:
+            model = _model_cache.get(key)
+            if model is not None:
+                _model_cache.move_to_end(key)
+                return model
+
+            model = genai.GenerativeModel(
+                model_name=self.model_name,
+                system_instruction=system_prompt
+            )
+            _model_cache[key] = model
+            if len(_model_cache) > MODEL_CACHE_MAX_SIZE:
+                _model_cache.popitem(last=False)
+            return model
+
+    async def _get_or_create_context_cache(self, system_prompt: str) -> Optional[str]:
+        """
+        Get server-side cache name for a system prompt, creating it on first use.
+
+        Only the system prompt is cached: it is the static prefix of every
+        request, while the user prompt (the dynamic suffix) is sent each time.
+
+        Returns:
+            cachedContents/<id>, or None to send the system prompt inline
+        """
+        if not self.enable_context_cache or len(system_prompt) < CONTEXT_CACHE_MIN_TOKENS * 4:
+            return None
+
+        key = _context_cache_key(system_prompt)
+        entry = self._context_caches.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            self._context_caches.move_to_end(key)
+            return entry[0]
+
+        # Per prompt, so creating one cache does not hold up requests for others
+        async with self._context_cache_locks.setdefault(key, asyncio.Lock()):
+            entry = self._context_caches.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                return entry[0]
+
+            name = None
+            try:
+                async with self._get_session().post(
+                    GEMINI_CACHE_URL,
+                    json={
+                        "model": f"models/{self.model_name}",
+                        "systemInstruction": {"parts": [{"text": system_prompt}]},
+                        "ttl": f"{CONTEXT_CACHE_TTL_SECONDS}s",
+                    },
+                    headers={"x-goog-api-key": self.api_key}
+                ) as response:
+                    data = await response.json(content_type=None)
+                if response.status != 200:
+                    raise RuntimeError(data.get("error", {}).get("message", f"HTTP {response.status}"))
+                name = data["name"]
+                print(f"✅ Context cache created: {name}")
+                # Refresh a minute before the server-side cache expires
+                expires_at = time.monotonic() + CONTEXT_CACHE_TTL_SECONDS - 60
+            except Exception as e:
+                # Remember the failure briefly, so every request does not retry
+                print(f"⚠️  Context cache unavailable, sending system prompt inline: {e}")
+                expires_at = time.monotonic() + CONTEXT_CACHE_RETRY_SECONDS
+
+            self._context_caches[key] = (name, expires_at)
+            self._context_caches.move_to_end(key)
+
+        # Evict outside the lock, so the just-stored prompt keeps its own
+        now = time.monotonic()
+        for stale_key in [k for k, (_, expires) in self._context_caches.items() if expires <= now]:
+            self._forget_context_cache(stale_key)
+        while len(self._context_caches) > CONTEXT_CACHE_MAX_ENTRIES:
+            self._forget_context_cache(next(iter(self._context_caches)))
+        return name
+
+    def _forget_context_cache(self, key: str):
+        """Remove a remembered cache name together with its creation lock."""
+        self._context_caches.pop(key, None)
+        lock = self._context_cache_locks.get(key)
+        # A held lock still guards a creation in progress; it stores a fresh entry
+        if lock is not None and not lock.locked():
+            del self._context_cache_locks[key]
+
+    def _drop_context_cache(self, system_prompt: str):
+        """Forget the cache of a system prompt (e.g. evicted server-side early)."""
+        print("⚠️  Context cache rejected, sending system prompt inline")
+        self._forget_context_cache(_context_cache_key(system_prompt))
+
     def check_connection(self) -> bool:
         """
         Check if Gemini API is accessible.
@@ -69,29 +357,82 @@ class GeminiClient:
     ) -> str:
         """
         Generate response using Gemini with native system instruction support (async).
+
+        Identical requests with temperature == 0 are answered from an in-memory
+        TTL/LRU cache. With a semantic cache and temperature <= SEMANTIC_CACHE_MAX_TEMPERATURE,
+        answers to similar prompts under the same system prompt are reused (and
+        stored in the exact-match cache under this request's key).
+        Concurrent identical requests share a single API call.
         """
+        key = LLMCache.make_key(
+            self.model_name, system_prompt, user_prompt, temperature, max_tokens,
+            hash_algo=self.response_cache.hash_algo
+        )
+        cacheable = LLMCache.is_cacheable(temperature)
+        if cacheable:
+            cached = await self.response_cache.get(key)
+            if cached is not None:
+                return cached
+
+        cache = self.semantic_cache if temperature <= SEMANTIC_CACHE_MAX_TEMPERATURE else None
+        if cache is not None:
+            try:
+                embedding = await cache.embed(user_prompt)
+                cached = cache.lookup(system_prompt, embedding)
+            except Exception as e:
+                # The semantic cache is an optimization; answer without it
+                print(f"⚠️  Semantic cache unavailable: {e}")
+                cache = None
+                cached = None
+            if cached is not None:
+                if cacheable:
+                    await self.response_cache.set(key, cached)
+                return cached
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._generate(system_prompt, user_prompt, temperature, max_tokens)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one cancelled caller does not cancel the call for the others
+        answer = await asyncio.shield(task)
+
+        if cacheable:
+            await self.response_cache.set(key, answer)
+        if cache is not None:
+            cache.add(system_prompt, embedding, answer)
+        return answer
+
+    async def _generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        """Call generateContent and return the answer text."""
         try:
             print(f"🤖 Generating with Gemini: {self.model_name}")
-            model = genai.GenerativeModel(
-                model_name=self.model_name,
-                system_instruction=system_prompt
-            )
-            generation_config = genai.types.GenerationConfig(
-                temperature=temperature,
-                max_output_tokens=max_tokens,
-                top_p=0.95,
-                top_k=40,
-            )
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                partial(
-                    model.generate_content,
-                    user_prompt,
-                    generation_config=generation_config
-                )
-            )
-            answer = response.text.strip()
+            cached_content = await self._get_or_create_context_cache(system_prompt)
+            payload = _build_payload(system_prompt, user_prompt, temperature, max_tokens, cached_content)
+            status, data = await self._post_generate(payload)
+            if cached_content is not None and status in STALE_CONTEXT_CACHE_STATUSES:
+                self._drop_context_cache(system_prompt)
+                payload = _build_payload(system_prompt, user_prompt, temperature, max_tokens)
+                status, data = await self._post_generate(payload)
+            if status != 200:
+                raise RuntimeError(data.get("error", {}).get("message", f"HTTP {status}"))
+
+            # Single text part is the common case; join only when there are several
+            parts = data["candidates"][0]["content"]["parts"]
+            if len(parts) == 1:
+                answer = parts[0].get("text", "").strip()
+            else:
+                answer = "".join([part.get("text", "") for part in parts]).strip()
+            if not answer:
+                raise RuntimeError("Empty answer (no text in response)")
             print(f"✅ Response generated ({len(answer)} chars)")
             return answer
         except Exception as e:
@@ -99,6 +440,28 @@ class GeminiClient:
             print(f"❌ {error_msg}")
             raise Exception(error_msg) from e
 
+    async def _post_generate(self, payload: dict) -> tuple[int, dict]:
+        """POST generateContent, retrying throttled requests; returns (status, body)."""
+        for attempt in range(MAX_ATTEMPTS):
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+            async with _request_semaphore:
+                async with self._get_session().post(
+                    GEMINI_API_URL.format(model=self.model_name),
+                    json=payload,
+                    headers={"x-goog-api-key": self.api_key}
+                ) as response:
+                    status = response.status
+                    if status == 200:
+                        return status, await response.json(content_type=None)
+                    retry_after = response.headers.get("Retry-After") if status in RETRYABLE_STATUSES else None
+                    data = await _error_body(response)
+            if status not in RETRYABLE_STATUSES or attempt == MAX_ATTEMPTS - 1:
+                return status, data
+            delay = _retry_delay(attempt, retry_after)
+            print(f"⚠️  Gemini returned {status}, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
     def stream_response(
         self,
         system_prompt: str,
@@ -108,25 +471,90 @@ class GeminiClient:
     ):
         """Stream response chunks (generator)."""
         print(f"🔄 Streaming with Gemini: {self.model_name}")
-        model = genai.GenerativeModel(
-            model_name=self.model_name,
-            system_instruction=system_prompt
-        )
-        generation_config = genai.types.GenerationConfig(
-            temperature=temperature,
-            max_output_tokens=max_tokens,
-            top_p=0.95,
-            top_k=40,
-        )
+        model = self._get_model(system_prompt)
+        generation_config = _generation_config(temperature, max_tokens)
         try:
             responses = model.generate_content(
                 user_prompt,
                 generation_config=generation_config,
                 stream=True
             )
+            # Read parts directly: chunk.text re-joins them on every access
+            # and raises for chunks without text
             for chunk in responses:
-                if hasattr(chunk, "text") and chunk.text:
-                    yield chunk.text
+                for candidate in chunk.candidates[:1]:
+                    for part in candidate.content.parts:
+                        if part.text:
+                            yield part.text
         except Exception as e:
             print(f"❌ Streaming error: {e}")
             return
+
+    async def generate_response_stream_async(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 500
+    ) -> AsyncIterator[str]:
+        """
+        Stream response chunks as they are generated (async generator).
+
+        Reads the server-sent events of streamGenerateContent directly, so no
+        thread is held while waiting for tokens.
+
+        Raises:
+            Exception: If the API call fails (also after some chunks were yielded)
+        """
+        print(f"🔄 Streaming with Gemini: {self.model_name}")
+        start_time = time.perf_counter()
+        first_chunk = True
+        try:
+            cached_content = await self._get_or_create_context_cache(system_prompt)
+            attempt = 0
+            while True:
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire()
+                payload = _build_payload(system_prompt, user_prompt, temperature, max_tokens, cached_content)
+                async with _request_semaphore:
+                    async with self._get_session().post(
+                        GEMINI_STREAM_URL.format(model=self.model_name),
+                        json=payload,
+                        headers={"x-goog-api-key": self.api_key}
+                    ) as response:
+                        if response.status == 200:
+                            async for line in response.content:
+                                if not line.startswith(b"data:"):
+                                    continue
+                                event = orjson.loads(line[5:])
+                                for candidate in event.get("candidates", ()):
+                                    for part in candidate.get("content", {}).get("parts", ()):
+                                        text = part.get("text")
+                                        if text:
+                                            if first_chunk:
+                                                time_to_first_token.observe(time.perf_counter() - start_time)
+                                                first_chunk = False
+                                            yield text
+                            return
+
+                        status = response.status
+                        retry_after = response.headers.get("Retry-After") if status in RETRYABLE_STATUSES else None
+                        data = await _error_body(response)
+
+                # Only the opening request is retried, before anything was yielded
+                if cached_content is not None and status in STALE_CONTEXT_CACHE_STATUSES:
+                    # Retry once with the system prompt inline
+                    self._drop_context_cache(system_prompt)
+                    cached_content = None
+                    continue
+                if status in RETRYABLE_STATUSES and attempt < MAX_ATTEMPTS - 1:
+                    delay = _retry_delay(attempt, retry_after)
+                    print(f"⚠️  Gemini returned {status}, retrying in {delay:.1f}s")
+                    attempt += 1
+                    await asyncio.sleep(delay)
+                    continue
+                raise RuntimeError(data.get("error", {}).get("message", f"HTTP {status}"))
+        except Exception as e:
+            error_msg = f"Gemini API Error: {str(e)}"
+            print(f"❌ Streaming error: {error_msg}")
+            raise Exception(error_msg) from e
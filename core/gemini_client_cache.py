@@ -0,0 +1,178 @@
+"""Exact-match response cache for Gemini generations."""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional, Protocol
+
+import orjson
+
+from metrics import response_cache_hits, response_cache_misses
+
+
+# Key digests: BLAKE2b-128 is faster on short inputs; SHA-256 matches older keys
+HASH_ALGOS = {
+    "blake2b": lambda data: hashlib.blake2b(data, digest_size=16),
+    "sha256": hashlib.sha256,
+}
+
+
+class CacheBackend(Protocol):
+    """Storage used by LLMCache."""
+
+    async def get(self, key: str) -> Optional[str]:
+        ...
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        ...
+
+    async def delete(self, key: str) -> None:
+        ...
+
+    async def clear(self) -> None:
+        ...
+
+
+class InMemoryLRUBackend:
+    """Per-process LRU with per-entry expiry."""
+
+    def __init__(self, max_size: int = 500):
+        self.max_size = max_size
+        # key -> (expires_at, value), least recently used first
+        self._entries: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """Redis storage shared by all workers (expiry handled by Redis)."""
+
+    def __init__(self, redis_url: str, prefix: str = "llm_cache:"):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(redis_url, decode_responses=True)
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._redis.get(self.prefix + key)
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        await self._redis.set(self.prefix + key, value, ex=ttl)
+
+    async def delete(self, key: str) -> None:
+        await self._redis.delete(self.prefix + key)
+
+    async def clear(self) -> None:
+        async for key in self._redis.scan_iter(match=self.prefix + "*"):
+            await self._redis.delete(key)
+
+
+class LLMCache:
+    """
+    Caches answers of deterministic (temperature == 0) generation requests.
+
+    Keys are 128-bit BLAKE2b digests of the normalized request (SHA-256 for
+    caches persisted by earlier versions); sampling at a higher temperature
+    is never served from the cache.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None, ttl: int = 3600, hash_algo: str = "blake2b"):
+        """
+        Initialize response cache.
+
+        Args:
+            backend: Storage backend (defaults to in-memory LRU)
+            ttl: Seconds an answer stays valid
+            hash_algo: Key digest, "blake2b" or "sha256"
+
+        Raises:
+            ValueError: If hash_algo is not supported
+        """
+        if hash_algo not in HASH_ALGOS:
+            raise ValueError(f"Unsupported hash_algo '{hash_algo}', expected one of {sorted(HASH_ALGOS)}")
+
+        self.backend = backend if backend is not None else InMemoryLRUBackend()
+        self.ttl = ttl
+        self.hash_algo = hash_algo
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def make_key(
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        max_tokens: int,
+        hash_algo: str = "blake2b"
+    ) -> str:
+        """Build key identifying a generation request."""
+        payload = orjson.dumps(
+            {
+                "model": model,
+                "system": system_prompt,
+                "user": user_prompt,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+            },
+            option=orjson.OPT_SORT_KEYS
+        )
+        return HASH_ALGOS[hash_algo](payload).hexdigest()
+
+    @staticmethod
+    def is_cacheable(temperature: float) -> bool:
+        """Only deterministic generations are cached."""
+        return temperature == 0
+
+    async def get(self, key: str) -> Optional[str]:
+        """Get cached answer, recording hit/miss (backend errors count as a miss)."""
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            print(f"⚠️  Response cache read failed: {e}")
+            value = None
+        if value is None:
+            self.stats["misses"] += 1
+            response_cache_misses.inc()
+        else:
+            self.stats["hits"] += 1
+            response_cache_hits.inc()
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        """Store answer (backend errors are logged and ignored)."""
+        try:
+            await self.backend.set(key, value, ttl=self.ttl)
+        except Exception as e:
+            print(f"⚠️  Response cache write failed: {e}")
+
+    async def delete(self, key: str) -> None:
+        """Remove answer."""
+        await self.backend.delete(key)
+
+    async def clear(self) -> None:
+        """Remove all answers."""
+        await self.backend.clear()
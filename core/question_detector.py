@@ -1,5 +1,7 @@
 """Question detection logic."""
 
+import re
+
 QUESTION_MARKERS = [
     "what", "why", "how", "when", "where", "who", "which", "can you", "could you", "would you",
     "jak", "dlaczego", "kiedy", "gdzie", "kto", "który", "czy", "możesz", "mógłbyś"
@@ -9,30 +11,40 @@ MIN_QUESTION_LENGTH = 8
 
 class QuestionDetector:
     """Detects if transcribed text is a question."""
-    
+
     def __init__(self, markers: list[str] = None, min_length: int = None):
         """
         Initialize detector.
-        
+
         Args:
             markers: List of question marker words
             min_length: Minimum text length to consider
         """
         self.markers = markers or QUESTION_MARKERS
         self.min_length = min_length or MIN_QUESTION_LENGTH
-    
+
+        # All markers are matched in a single case-insensitive pass. Markers must start
+        # at a word boundary ("show" is not "how") but may be inflected ("jakie")
+        self._pattern = re.compile(
+            r"\b(?:" + "|".join(re.escape(marker) for marker in self.markers) + ")",
+            re.IGNORECASE
+        )
+
     def is_question(self, text: str) -> bool:
         """
         Check if text is a question.
-        
+
         Args:
             text: Transcribed text to analyze
-            
+
         Returns:
             True if text appears to be a question
         """
         if not text or len(text) < self.min_length:
             return False
-        
-        text_lower = text.lower()
-        return any(marker in text_lower for marker in self.markers)
+
+        # Trailing question mark (ASCII or fullwidth) is conclusive; skip the marker scan
+        if text.rstrip().endswith(("?", "？")):
+            return True
+
+        return self._pattern.search(text) is not None
@@ -0,0 +1,141 @@
+"""Semantic (embedding nearest-neighbour) cache for LLM answers."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+
+class SemanticCache:
+    """
+    Caches answers by embedding of the user prompt.
+
+    Entries are partitioned by system prompt, so an answer is only reused for
+    the same instructions/context. Within a partition, the nearest stored
+    prompt (cosine similarity) is returned when it exceeds the threshold.
+
+    Embedding requests arriving within a short window are encoded as one
+    batch on a dedicated thread, away from the default executor.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[List[str]], np.ndarray],
+        threshold: float = 0.92,
+        max_entries: int = 1000,
+        max_batch_size: int = 32,
+        batch_window: float = 0.01
+    ):
+        """
+        Initialize semantic cache.
+
+        Args:
+            embed: Function returning one embedding row per text (blocking)
+            threshold: Minimum cosine similarity for a cache hit
+            max_entries: Maximum cached answers per system prompt (oldest evicted)
+            max_batch_size: Maximum texts per embedding call
+            batch_window: Seconds to wait for more texts after the first one
+        """
+        self._embed = embed
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        # system prompt -> (L2-normalized embedding matrix, answers)
+        self._entries: Dict[str, tuple[np.ndarray, List[str]]] = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embed")
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def warmup(self):
+        """Run one embedding so the first request does not pay model cold start (blocking)."""
+        self._embed_batch(["warmup"])
+
+    async def embed(self, text: str) -> np.ndarray:
+        """Compute L2-normalized embedding off the event loop (batched with concurrent calls)."""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((text, future))
+        return await future
+
+    async def _run(self):
+        """Collect queued texts into batches and embed them."""
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self._queue.get()]
+            await asyncio.sleep(self.batch_window)
+            while len(items) < self.max_batch_size and not self._queue.empty():
+                items.append(self._queue.get_nowait())
+
+            try:
+                vectors = await loop.run_in_executor(
+                    self._executor, self._embed_batch, [text for text, _ in items]
+                )
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), vector in zip(items, vectors):
+                if not future.done():
+                    future.set_result(vector)
+
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        """Embed texts and L2-normalize each row."""
+        vectors = np.asarray(self._embed(texts), dtype=np.float32).reshape(len(texts), -1)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    async def aclose(self):
+        """Stop the batching worker and its thread."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        self._executor.shutdown(wait=False)
+
+    def lookup(self, system_prompt: str, embedding: np.ndarray) -> Optional[str]:
+        """
+        Find cached answer for a semantically similar prompt.
+
+        Args:
+            system_prompt: System prompt the answer must have been generated with
+            embedding: Normalized embedding of the user prompt
+
+        Returns:
+            Cached answer or None on miss
+        """
+        entry = self._entries.get(system_prompt)
+        if entry is None:
+            return None
+
+        matrix, answers = entry
+        similarities = matrix @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] >= self.threshold:
+            return answers[best]
+        return None
+
+    def add(self, system_prompt: str, embedding: np.ndarray, answer: str):
+        """Store answer under the prompt embedding."""
+        entry = self._entries.get(system_prompt)
+        if entry is None:
+            self._entries[system_prompt] = (embedding[None, :], [answer])
+            return
+
+        matrix, answers = entry
+        if len(answers) >= self.max_entries:
+            matrix, answers = matrix[1:], answers[1:]
+        self._entries[system_prompt] = (np.vstack([matrix, embedding]), answers + [answer])
+
+    def clear(self):
+        """Remove all cached answers."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return sum(len(answers) for _, answers in self._entries.values())
@@ -0,0 +1,59 @@
+"""Client-side rate limiting for outgoing API requests."""
+
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+
+class TokenBucket:
+    """
+    Token bucket limiting the request rate of this process.
+
+    Allows bursts of up to `burst` requests, refilled at `rps` tokens per
+    second. Callers wait for a token instead of being rejected.
+    """
+
+    def __init__(
+        self,
+        rps: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ):
+        """
+        Initialize token bucket.
+
+        Args:
+            rps: Sustained requests per second
+            burst: Maximum requests allowed back to back
+            clock: Monotonic time source in seconds
+            sleep: Coroutine function used to wait for tokens
+
+        Raises:
+            ValueError: If rps or burst is not positive
+        """
+        if rps <= 0 or burst <= 0:
+            raise ValueError("rps and burst must be positive")
+
+        self.rps = rps
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rps)
+        self._updated = now
+
+    async def acquire(self):
+        """Take one token, sleeping until one is available."""
+        # The lock keeps waiters in FIFO order while one of them sleeps
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await self._sleep((1 - self._tokens) / self.rps)
+                self._refill()
+            self._tokens -= 1
@@ -1,46 +1,273 @@
-"""Audio transcription using Whisper AI."""
+"""Audio transcription using Whisper AI (faster-whisper / CTranslate2 backend)."""
 
-import whisper
+import asyncio
+
+import ctranslate2
+from faster_whisper import WhisperModel
+from faster_whisper.audio import pad_or_trim
+from faster_whisper.tokenizer import Tokenizer
+from faster_whisper.transcribe import get_compression_ratio, get_suppressed_tokens
+from faster_whisper.vad import VadOptions, get_speech_timestamps
 import numpy as np
 from typing import Optional
 
+# Quality gates of WhisperModel.transcribe (its defaults), applied to batched decoding
+NO_SPEECH_THRESHOLD = 0.6
+LOG_PROB_THRESHOLD = -1.0
+COMPRESSION_RATIO_THRESHOLD = 2.4
+
 
 class TranscriptionEngine:
     """Handles audio transcription using Whisper."""
-    
-    def __init__(self, model_name: str = "base", language: str = "pl", fp16: bool = False):
+
+    def __init__(
+        self,
+        model_name: str = "base",
+        language: str = "pl",
+        device: str = "auto",
+        compute_type: Optional[str] = None,
+        vad_filter: bool = True,
+        cpu_threads: int = 0
+    ):
         """
         Initialize Whisper model.
-        
+
         Args:
             model_name: Whisper model size (tiny, base, small, medium, large)
             language: Language code for transcription
-            fp16: Use FP16 precision (requires GPU)
+            device: "cpu", "cuda" or "auto" (use GPU when available)
+            compute_type: CTranslate2 compute type; defaults to int8 on CPU
+                and float16 on GPU
+            vad_filter: Run Silero VAD first and only transcribe speech regions
+            cpu_threads: CTranslate2 threads for CPU inference (0 = library default of 4)
         """
-        print(f"🔄 Loading Whisper model '{model_name}'...")
-        self.model = whisper.load_model(model_name)
+        if device == "auto":
+            device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+        if not compute_type:
+            compute_type = "float16" if device == "cuda" else "int8"
+
+        print(f"🔄 Loading Whisper model '{model_name}' ({device}, {compute_type})...")
+        self.model = WhisperModel(
+            model_name,
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=cpu_threads
+        )
         self.language = language
-        self.fp16 = fp16
+        self.device = device
+        self.compute_type = compute_type
+        self.vad_options = VadOptions() if vad_filter else None
+
+        # Decoder prompt shared by all clips of a batch (fixed language, no timestamps)
+        self._tokenizer = Tokenizer(
+            self.model.hf_tokenizer,
+            self.model.model.is_multilingual,
+            task="transcribe",
+            language=language
+        )
+        self._prompt = self.model.get_prompt(self._tokenizer, [], without_timestamps=True)
+        self._suppress_tokens = list(get_suppressed_tokens(self._tokenizer, [-1]))
         print("✅ Whisper model loaded")
-    
+
     def transcribe(self, audio_data: np.ndarray) -> Optional[str]:
         """
         Transcribe audio data to text.
-        
+
         Args:
             audio_data: NumPy array of audio samples
-            
+
         Returns:
             Transcribed text or None if failed
         """
         try:
-            result = self.model.transcribe(
-                audio_data,
-                language=self.language,
-                fp16=self.fp16
+            if self.vad_options is not None:
+                audio_data = self._extract_speech(audio_data)
+                if audio_data is None:
+                    return None
+
+            return self._transcribe_speech(audio_data)
+        except Exception as e:
+            print(f"❌ Transcription error: {e}")
+            return None
+
+    def transcribe_batch(self, clips: list[np.ndarray]) -> list[Optional[str]]:
+        """
+        Transcribe several clips with one encoder/decoder pass.
+
+        Clips of up to 30 s (after VAD) are padded to Whisper's window and
+        decoded together. Longer clips, a lone clip, and decodes failing the
+        log-prob/compression checks go through WhisperModel.transcribe (with
+        its temperature fallback); likely silence is dropped.
+
+        Args:
+            clips: NumPy arrays of audio samples
+
+        Returns:
+            Transcribed text (or None) for each clip, in order
+        """
+        texts: list[Optional[str]] = [None] * len(clips)
+        batch = []
+
+        # Clips come from different requests: an error only affects its own clip
+        for i, audio_data in enumerate(clips):
+            try:
+                if self.vad_options is not None:
+                    audio_data = self._extract_speech(audio_data)
+                    if audio_data is None:
+                        continue
+            except Exception as e:
+                print(f"❌ Transcription error: {e}")
+                continue
+            if len(audio_data) > self.model.feature_extractor.n_samples:
+                texts[i] = self._transcribe_clip(audio_data)
+            else:
+                batch.append((i, audio_data))
+
+        if len(batch) == 1:
+            i, audio_data = batch[0]
+            texts[i] = self._transcribe_clip(audio_data)
+            return texts
+        if not batch:
+            return texts
+
+        try:
+            features = np.stack([
+                pad_or_trim(self.model.feature_extractor(audio_data)[..., :-1])
+                for _, audio_data in batch
+            ])
+            results = self.model.model.generate(
+                self.model.encode(features),
+                [self._prompt] * len(batch),
+                beam_size=1,
+                max_length=self.model.max_length,
+                suppress_blank=True,
+                suppress_tokens=self._suppress_tokens,
+                return_scores=True,
+                return_no_speech_prob=True
             )
-            text = result['text'].strip()
-            return text if text else None
+        except Exception as e:
+            print(f"❌ Batch transcription error, transcribing clips one by one: {e}")
+            for i, audio_data in batch:
+                texts[i] = self._transcribe_clip(audio_data)
+            return texts
+
+        for (i, audio_data), result in zip(batch, results):
+            tokens = result.sequences_ids[0]
+            # Score is the length-normalized log prob (length_penalty=1)
+            avg_logprob = result.scores[0] * len(tokens) / (len(tokens) + 1)
+            if avg_logprob < LOG_PROB_THRESHOLD and result.no_speech_prob > NO_SPEECH_THRESHOLD:
+                continue
+
+            text = self._tokenizer.decode(tokens).strip()
+            if avg_logprob < LOG_PROB_THRESHOLD or get_compression_ratio(text) > COMPRESSION_RATIO_THRESHOLD:
+                texts[i] = self._transcribe_clip(audio_data)
+            else:
+                texts[i] = text if text else None
+
+        return texts
+
+    def _transcribe_clip(self, audio_data: np.ndarray) -> Optional[str]:
+        """Transcribe one clip of a batch on its own (errors give None for that clip only)."""
+        try:
+            return self._transcribe_speech(audio_data)
         except Exception as e:
             print(f"❌ Transcription error: {e}")
             return None
+
+    def _transcribe_speech(self, audio_data: np.ndarray) -> Optional[str]:
+        """Run Whisper on audio that already passed VAD."""
+        segments, _ = self.model.transcribe(
+            audio_data,
+            language=self.language,
+            beam_size=1
+        )
+        # Segments are decoded lazily while iterating; their text keeps leading spaces
+        text = "".join(segment.text for segment in segments).strip()
+        return text if text else None
+
+    def _extract_speech(self, audio_data: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Keep only the speech regions of 16 kHz audio.
+
+        Args:
+            audio_data: NumPy array of audio samples
+
+        Returns:
+            Concatenated speech samples or None if no speech was detected
+        """
+        speech_timestamps = get_speech_timestamps(audio_data, self.vad_options)
+        if not speech_timestamps:
+            return None
+
+        return np.concatenate([audio_data[ts["start"]:ts["end"]] for ts in speech_timestamps])
+
+
+class AsyncTranscriptionEngine:
+    """
+    Micro-batches concurrent transcription requests.
+
+    Requests arriving within a short window are transcribed together with
+    TranscriptionEngine.transcribe_batch in a worker thread, so N concurrent
+    users cost one model pass instead of N.
+    """
+
+    def __init__(self, engine: TranscriptionEngine, max_batch_size: int = 8, batch_window: float = 0.02):
+        """
+        Initialize batcher.
+
+        Args:
+            engine: Loaded transcription engine
+            max_batch_size: Maximum clips per model pass
+            batch_window: Seconds to wait for more requests after the first one
+        """
+        self.engine = engine
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def transcribe_async(self, audio_data: np.ndarray) -> Optional[str]:
+        """
+        Transcribe audio data, batched with concurrent requests.
+
+        Args:
+            audio_data: NumPy array of audio samples
+
+        Returns:
+            Transcribed text or None if failed
+        """
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((audio_data, future))
+        return await future
+
+    async def _run(self):
+        """Collect queued requests into batches and transcribe them."""
+        while True:
+            items = [await self._queue.get()]
+            await asyncio.sleep(self.batch_window)
+            while len(items) < self.max_batch_size and not self._queue.empty():
+                items.append(self._queue.get_nowait())
+
+            try:
+                texts = await asyncio.to_thread(
+                    self.engine.transcribe_batch, [audio_data for audio_data, _ in items]
+                )
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), text in zip(items, texts):
+                if not future.done():
+                    future.set_result(text)
+
+    async def aclose(self):
+        """Stop the batching worker."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
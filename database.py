@@ -1,48 +1,53 @@
 """Database configuration and session management."""
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import AsyncGenerator
 from config import config
 
+
+def _async_url(url: str) -> str:
+    """Use the asyncpg driver for plain postgresql:// URLs."""
+    if url.startswith("postgresql://"):
+        return "postgresql+asyncpg://" + url[len("postgresql://"):]
+    return url
+
+
 # Create database engine
-engine = create_engine(
-    config.database_url,
+engine = create_async_engine(
+    _async_url(config.database_url),
     pool_pre_ping=True,
-    pool_size=10,
+    pool_size=20,
     max_overflow=20
 )
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create session factory (objects stay usable after commit without a reload)
+SessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False)
 
 # Create base class for models
 Base = declarative_base()
 
 
-def get_db() -> Generator[Session, None, None]:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Get database session."""
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-def init_db():
+async def init_db():
     """Initialize database (create tables)."""
     from db_models import User, InterviewContext, InterviewHistory
-    Base.metadata.create_all(bind=engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
     print("✅ Database tables created")
 
 
-def check_db_connection() -> bool:
+async def check_db_connection() -> bool:
     """Check if database connection is working."""
     try:
-        db = SessionLocal()
-        db.execute(text("SELECT 1"))
-        db.close()
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
         return True
     except Exception as e:
         print(f"❌ Database connection failed: {e}")
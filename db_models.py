@@ -1,8 +1,8 @@
 """Database models for Interview Copilot."""
 
-from sqlalchemy import Column, String, DateTime, Text, Boolean, ForeignKey, Integer
+from sqlalchemy import Column, String, DateTime, Text, Boolean, ForeignKey, Integer, Index
+from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from datetime import datetime
 from database import Base
 
 
@@ -15,8 +15,8 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     full_name = Column(String, nullable=True)
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
     # Relationships
     contexts = relationship("InterviewContext", back_populates="user", cascade="all, delete-orphan")
@@ -26,14 +26,16 @@ class User(Base):
 class InterviewContext(Base):
     """Interview context table."""
     __tablename__ = "interview_contexts"
+    # One context per user; also the conflict target of the upsert in update_context
+    __table_args__ = (Index("ix_ctx_user", "user_id", unique=True),)
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(String, ForeignKey("users.id"), nullable=False)
     cv = Column(Text, nullable=False, default="")
     company = Column(String, nullable=False, default="")
     position = Column(String, nullable=False, default="")
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
     # Relationship
     user = relationship("User", back_populates="contexts")
@@ -42,12 +44,14 @@ class InterviewContext(Base):
 class InterviewHistory(Base):
     """Interview history table."""
     __tablename__ = "interview_history"
+    # Serves "recent history for user" (ORDER BY created_at DESC LIMIT n) as an index range scan
+    __table_args__ = (Index("ix_hist_user_created", "user_id", "created_at"),)
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(String, ForeignKey("users.id"), nullable=False)
     question = Column(Text, nullable=False)
     answer = Column(Text, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    created_at = Column(DateTime, server_default=func.now(), index=True)
 
     # Relationship
     user = relationship("User", back_populates="history")
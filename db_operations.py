@@ -1,43 +1,46 @@
 """Database operations for Interview Copilot."""
 
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, insert, select, Row
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List, Dict
-from datetime import datetime
 from db_models import User, InterviewContext, InterviewHistory
 from models import Context
 
 
-def create_user_db(db: Session, user_id: str, email: str, hashed_password: str, full_name: Optional[str] = None) -> User:
+async def create_user_db(db: AsyncSession, user_id: str, email: str, hashed_password: str, full_name: Optional[str] = None) -> User:
     """Create user in database."""
     db_user = User(
         id=user_id,
         email=email,
         hashed_password=hashed_password,
         full_name=full_name,
-        is_active=True,
-        created_at=datetime.utcnow()
+        is_active=True
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 
-def get_user_by_email(db: Session, email: str) -> Optional[User]:
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
     """Get user by email."""
-    return db.query(User).filter(User.email == email).first()
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalar_one_or_none()
 
 
-def get_user_by_id(db: Session, user_id: str) -> Optional[User]:
+async def get_user_by_id(db: AsyncSession, user_id: str) -> Optional[User]:
     """Get user by ID."""
-    return db.query(User).filter(User.id == user_id).first()
+    return await db.get(User, user_id)
 
 
-def get_context(user_id: str, db: Session) -> Optional[Context]:
+async def get_context(user_id: str, db: AsyncSession) -> Optional[Context]:
     """Get interview context for user."""
-    db_context = db.query(InterviewContext).filter(
-        InterviewContext.user_id == user_id
-    ).order_by(InterviewContext.updated_at.desc()).first()
+    result = await db.execute(
+        select(InterviewContext).where(InterviewContext.user_id == user_id)
+    )
+    db_context = result.scalar_one_or_none()
 
     if db_context:
         return Context(
@@ -49,68 +52,79 @@ def get_context(user_id: str, db: Session) -> Optional[Context]:
     return Context()
 
 
-def update_context(user_id: str, context: Context, db: Session) -> InterviewContext:
-    """Update or create interview context for user."""
-    db_context = db.query(InterviewContext).filter(
-        InterviewContext.user_id == user_id
-    ).order_by(InterviewContext.updated_at.desc()).first()
-
-    if db_context:
-        # Update existing context
-        db_context.cv = context.cv
-        db_context.company = context.company
-        db_context.position = context.position
-        db_context.updated_at = datetime.utcnow()
-    else:
-        # Create new context
-        db_context = InterviewContext(
-            user_id=user_id,
-            cv=context.cv,
-            company=context.company,
-            position=context.position,
-            created_at=datetime.utcnow()
-        )
-        db.add(db_context)
+async def update_context(user_id: str, context: Context, db: AsyncSession) -> InterviewContext:
+    """Update or create interview context for user (single upsert statement)."""
+    upsert = sqlite_insert if db.bind.dialect.name == "sqlite" else pg_insert
+    stmt = upsert(InterviewContext).values(
+        user_id=user_id,
+        cv=context.cv,
+        company=context.company,
+        position=context.position
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={
+            "cv": stmt.excluded.cv,
+            "company": stmt.excluded.company,
+            "position": stmt.excluded.position,
+            "updated_at": func.now(),
+        }
+    ).returning(InterviewContext)
 
-    db.commit()
-    db.refresh(db_context)
+    db_context = (await db.execute(stmt)).scalar_one()
+    await db.commit()
     return db_context
 
 
-def add_history_entry(user_id: str, question: str, answer: str, db: Session) -> InterviewHistory:
-    """Add history entry for user."""
-    db_history = InterviewHistory(
+async def add_history_entry(user_id: str, question: str, answer: str, db: AsyncSession) -> Row:
+    """Add history entry for user; returns the new row's (id, created_at)."""
+    stmt = insert(InterviewHistory).values(
         user_id=user_id,
         question=question,
-        answer=answer,
-        created_at=datetime.utcnow()
-    )
-    db.add(db_history)
-    db.commit()
-    db.refresh(db_history)
-    return db_history
+        answer=answer
+    ).returning(InterviewHistory.id, InterviewHistory.created_at)
+    row = (await db.execute(stmt)).one()
+    await db.commit()
+    return row
+
+
+async def add_history_entries_bulk(db: AsyncSession, entries: List[Dict]) -> None:
+    """
+    Add many history entries in a single statement.
+
+    Each entry needs user_id, question and answer; created_at is set by the database.
+    """
+    if not entries:
+        return
 
+    await db.execute(insert(InterviewHistory), entries)
+    await db.commit()
 
-def get_history(user_id: str, db: Session, limit: int = 100) -> List[Dict]:
+
+async def get_history(user_id: str, db: AsyncSession, limit: int = 100) -> List[Dict]:
     """Get interview history for user."""
-    db_history = db.query(InterviewHistory).filter(
-        InterviewHistory.user_id == user_id
-    ).order_by(InterviewHistory.created_at.desc()).limit(limit).all()
+    # Plain column tuples: no ORM instances or identity-map bookkeeping per row
+    result = await db.execute(
+        select(InterviewHistory.question, InterviewHistory.answer, InterviewHistory.created_at)
+        .where(InterviewHistory.user_id == user_id)
+        .order_by(InterviewHistory.created_at.desc())
+        .limit(limit)
+    )
 
     return [
         {
-            "question": entry.question,
-            "answer": entry.answer,
-            "timestamp": entry.created_at.isoformat()
+            "question": question,
+            "answer": answer,
+            "timestamp": created_at.isoformat()
         }
-        for entry in db_history
+        for question, answer, created_at in result
     ]
 
 
-def clear_history(db: Session, user_id: str) -> int:
+async def clear_history(db: AsyncSession, user_id: str) -> int:
     """Clear all history for user."""
-    count = db.query(InterviewHistory).filter(
-        InterviewHistory.user_id == user_id
-    ).delete()
-    db.commit()
-    return count
+    result = await db.execute(
+        delete(InterviewHistory).where(InterviewHistory.user_id == user_id)
+    )
+    await db.commit()
+    return result.rowcount
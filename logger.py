@@ -2,20 +2,10 @@
 
 import logging
 import sys
-from pythonjsonlogger import jsonlogger
+from pythonjsonlogger.orjson import OrjsonFormatter
 from config import config
 
 
-class CustomJsonFormatter(jsonlogger.JsonFormatter):
-    """Custom JSON formatter with additional fields."""
-
-    def add_fields(self, log_record, record, message_dict):
-        super().add_fields(log_record, record, message_dict)
-        log_record['app'] = 'interview-copilot'
-        log_record['environment'] = 'production' if not config.api_debug else 'development'
-        log_record['level'] = record.levelname
-
-
 def setup_logging():
     """Configure structured JSON logging."""
     # Create logger
@@ -29,10 +19,15 @@ def setup_logging():
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.DEBUG if config.api_debug else logging.INFO)
 
-    # Use JSON formatter for structured logs
-    formatter = CustomJsonFormatter(
-        '%(timestamp)s %(level)s %(name)s %(message)s %(pathname)s %(lineno)d',
-        rename_fields={'timestamp': '@timestamp', 'level': 'severity'}
+    # Structured JSON logs serialized with orjson; constant fields are attached once
+    formatter = OrjsonFormatter(
+        '%(levelname)s %(name)s %(message)s %(pathname)s %(lineno)d',
+        rename_fields={'levelname': 'severity'},
+        static_fields={
+            'app': 'interview-copilot',
+            'environment': 'production' if not config.api_debug else 'development'
+        },
+        timestamp='@timestamp'
     )
     console_handler.setFormatter(formatter)
 
@@ -46,21 +41,21 @@ def setup_logging():
 logger = setup_logging()
 
 
-def log_info(message: str, **kwargs):
-    """Log info message with additional context."""
-    logger.info(message, extra=kwargs)
+def log_info(message: str, *args, **kwargs):
+    """Log info message with additional context (args are %-formatted lazily)."""
+    logger.info(message, *args, extra=kwargs)
 
 
-def log_error(message: str, **kwargs):
-    """Log error message with additional context."""
-    logger.error(message, extra=kwargs, exc_info=True)
+def log_error(message: str, *args, **kwargs):
+    """Log error message with additional context (args are %-formatted lazily)."""
+    logger.error(message, *args, extra=kwargs, exc_info=True)
 
 
-def log_warning(message: str, **kwargs):
-    """Log warning message with additional context."""
-    logger.warning(message, extra=kwargs)
+def log_warning(message: str, *args, **kwargs):
+    """Log warning message with additional context (args are %-formatted lazily)."""
+    logger.warning(message, *args, extra=kwargs)
 
 
-def log_debug(message: str, **kwargs):
-    """Log debug message with additional context."""
-    logger.debug(message, extra=kwargs)
+def log_debug(message: str, *args, **kwargs):
+    """Log debug message with additional context (args are %-formatted lazily)."""
+    logger.debug(message, *args, extra=kwargs)
@@ -1,12 +1,15 @@
 """Prometheus metrics for Interview Copilot API."""
 
-from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import (
+    CollectorRegistry, Counter, Histogram, Gauge, generate_latest, multiprocess, CONTENT_TYPE_LATEST
+)
 from fastapi import Response
+import os
 import time
-from functools import wraps
-from logger import logger
+from functools import wraps, lru_cache
 
-# Define metrics
+# Define metrics. With PROMETHEUS_MULTIPROC_DIR set (multiple uvicorn workers), values
+# live in per-process mmapped files instead of lock-protected in-process values
 request_count = Counter(
     'http_requests_total',
     'Total HTTP requests',
@@ -39,14 +42,30 @@ generation_duration = Histogram(
     'Answer generation processing time'
 )
 
+time_to_first_token = Histogram(
+    'generation_time_to_first_token_seconds',
+    'Time from streaming request to the first generated chunk'
+)
+
 question_detected_count = Counter(
     'questions_detected_total',
     'Total questions detected'
 )
 
+response_cache_hits = Counter(
+    'gemini_response_cache_hits_total',
+    'Gemini responses served from the exact-match cache'
+)
+
+response_cache_misses = Counter(
+    'gemini_response_cache_misses_total',
+    'Cacheable Gemini requests that missed the exact-match cache'
+)
+
 active_sessions = Gauge(
     'active_sessions',
-    'Number of active sessions'
+    'Number of active sessions',
+    multiprocess_mode='livesum'
 )
 
 error_count = Counter(
@@ -56,29 +75,49 @@ error_count = Counter(
 )
 
 
+# Labelled children are resolved once per label combination instead of on every request
+@lru_cache(maxsize=512)
+def request_counter(method: str, endpoint: str, status: int):
+    """Get the request_count child for a label combination."""
+    return request_count.labels(method=method, endpoint=endpoint, status=status)
+
+
+@lru_cache(maxsize=512)
+def request_timer(method: str, endpoint: str):
+    """Get the request_duration child for a label combination."""
+    return request_duration.labels(method=method, endpoint=endpoint)
+
+
+@lru_cache(maxsize=128)
+def error_counter(error_type: str, endpoint: str):
+    """Get the error_count child for a label combination."""
+    return error_count.labels(error_type=error_type, endpoint=endpoint)
+
+
 def track_time(metric_histogram):
-    """Decorator to track execution time."""
+    """Decorator to track execution time of a coroutine function."""
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            start_time = time.time()
+            start = time.perf_counter_ns()
             try:
-                result = await func(*args, **kwargs)
-                return result
+                return await func(*args, **kwargs)
             finally:
-                duration = time.time() - start_time
-                metric_histogram.observe(duration)
-                logger.debug(f"{func.__name__} took {duration:.3f}s", extra={
-                    'function': func.__name__,
-                    'duration': duration
-                })
+                metric_histogram.observe((time.perf_counter_ns() - start) * 1e-9)
         return wrapper
     return decorator
 
 
 async def get_metrics():
-    """Generate Prometheus metrics."""
+    """Generate Prometheus metrics (aggregated over workers in multiprocess mode)."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        content = generate_latest(registry)
+    else:
+        content = generate_latest()
+
     return Response(
-        content=generate_latest(),
+        content=content,
         media_type=CONTENT_TYPE_LATEST
     )
@@ -4,7 +4,7 @@ from dataclasses import dataclass, asdict
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class Context:
     """User context for interview preparation."""
     cv: str = ''
@@ -13,7 +13,7 @@ class Context:
     custom_system_prompt: str = ''  # User-customizable system prompt
 
 
-@dataclass
+@dataclass(slots=True)
 class HistoryEntry:
     """Single Q&A history entry."""
     question: str
@@ -0,0 +1,31 @@
+-- Bring an existing PostgreSQL database in line with db_models.py indexes.
+-- New databases get these from Base.metadata.create_all; this script is for
+-- databases created before them. Safe to run more than once:
+--   psql "$DATABASE_URL" -f scripts/migrate_indexes.sql
+
+BEGIN;
+
+-- interview_contexts is one row per user: keep each user's most recently
+-- updated context (highest id on ties) and delete the rest
+DELETE FROM interview_contexts AS ctx
+USING (
+    SELECT id,
+           ROW_NUMBER() OVER (
+               PARTITION BY user_id
+               ORDER BY updated_at DESC NULLS LAST, id DESC
+           ) AS position
+    FROM interview_contexts
+) AS ranked
+WHERE ctx.id = ranked.id
+  AND ranked.position > 1;
+
+-- Replaced by the unique per-user index (conflict target of the context upsert)
+DROP INDEX IF EXISTS ix_ctx_user_updated;
+CREATE UNIQUE INDEX IF NOT EXISTS ix_ctx_user
+    ON interview_contexts (user_id);
+
+-- Recent history for a user (ORDER BY created_at DESC LIMIT n)
+CREATE INDEX IF NOT EXISTS ix_hist_user_created
+    ON interview_history (user_id, created_at);
+
+COMMIT;
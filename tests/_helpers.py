@@ -0,0 +1,95 @@
+"""Shared helpers for tests: assertions and fake Gemini HTTP responses."""
+
+import json
+import re
+from typing import Callable, Iterable, Optional, Union
+
+
+def any_of(words: Iterable[str]) -> re.Pattern:
+    """Compile words into one case-insensitive alternation (single scan per search)."""
+    return re.compile("|".join(re.escape(word) for word in words), re.IGNORECASE)
+
+
+def contains_any(text: str, pattern: re.Pattern) -> bool:
+    """Check whether text contains any word of a pattern built by any_of()."""
+    return pattern.search(text) is not None
+
+
+def gemini_answer(*texts: str) -> dict:
+    """generateContent body with one candidate made of the given text parts."""
+    return {"candidates": [{"content": {"parts": [{"text": text} for text in texts]}}]}
+
+
+def gemini_error(message: str) -> dict:
+    """Gemini API error body."""
+    return {"error": {"message": message}}
+
+
+class FakeContent:
+    """Async iterator over raw SSE lines (aiohttp StreamReader stub)."""
+
+    def __init__(self, lines: Iterable[bytes]):
+        self._lines = iter(lines)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._lines)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class FakeResponse:
+    """
+    aiohttp response stub.
+
+    body is returned by json() as-is; a str body is parsed like aiohttp does
+    (empty gives None, anything that is not JSON raises ValueError).
+    """
+
+    def __init__(
+        self,
+        status: int = 200,
+        body: Union[dict, str, None] = None,
+        lines: Iterable[bytes] = (),
+        headers: Optional[dict] = None
+    ):
+        self.status = status
+        self.body = body
+        self.content = FakeContent(lines)
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def json(self, content_type=None):
+        if isinstance(self.body, str):
+            return json.loads(self.body) if self.body.strip() else None
+        return self.body
+
+
+class FakeSession:
+    """
+    aiohttp ClientSession stub recording POSTs as (url, json) in `calls`.
+
+    Answers with the queued responses in order (the last one repeats), or
+    with handler(url, json) when given.
+    """
+
+    def __init__(self, *responses: FakeResponse, handler: Optional[Callable[[str, dict], FakeResponse]] = None):
+        self.calls: list[tuple[str, dict]] = []
+        self._responses = list(responses)
+        self._handler = handler
+
+    def post(self, url, json, headers):
+        self.calls.append((url, json))
+        if self._handler is not None:
+            return self._handler(url, json)
+        if len(self._responses) > 1:
+            return self._responses.pop(0)
+        return self._responses[0]
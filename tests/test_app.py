@@ -0,0 +1,60 @@
+"""Tests for app engine setup and the streaming answer endpoint."""
+
+import httpx
+import pytest
+
+import app as app_module
+from core.gemini_client import GeminiClient
+from tests._helpers import FakeResponse, FakeSession, gemini_error
+
+
+@pytest.fixture
+def failing_gemini(monkeypatch):
+    """Install a Gemini client whose API answers with HTTP 500."""
+    client = GeminiClient(api_key="test_key")
+    monkeypatch.setattr(client, "_get_session", lambda: FakeSession(FakeResponse(500, gemini_error("Internal error"))))
+    monkeypatch.setattr(app_module, "gemini_client", client)
+    # Skip loading Whisper in initialize_engines()
+    monkeypatch.setattr(app_module, "transcription_engine", object())
+    return client
+
+
+@pytest.mark.asyncio
+class TestGenerateStream:
+    """Test suite for /api/generate/stream."""
+
+    async def test_api_error_sends_error_event(self, failing_gemini):
+        """Test that a failed generation ends with an error event, not done."""
+        transport = httpx.ASGITransport(app=app_module.app)
+        async with httpx.AsyncClient(transport=transport, base_url="https://test") as http:
+            response = await http.post("/api/generate/stream", json={
+                "question": "What is FastAPI?",
+                "context": {"company": "Acme", "position": "Engineer"}
+            })
+
+        assert response.status_code == 200
+        assert "event: error" in response.text
+        assert "Internal error" in response.text
+        assert "event: done" not in response.text
+
+
+class TestInitializeEngines:
+    """Test suite for engine initialization."""
+
+    def test_missing_embedding_model_does_not_block_gemini(self, monkeypatch):
+        """Test that a semantic cache load failure leaves generation available."""
+        import dataclasses
+        import sys
+
+        monkeypatch.setattr(app_module, "config", dataclasses.replace(
+            app_module.config, semantic_cache_model="all-MiniLM-L6-v2", gemini_api_key="test_key"
+        ))
+        monkeypatch.setitem(sys.modules, "sentence_transformers", None)
+        monkeypatch.setattr(app_module, "semantic_cache", None)
+        monkeypatch.setattr(app_module, "gemini_client", None)
+        monkeypatch.setattr(app_module, "transcription_engine", object())
+
+        app_module.initialize_engines()
+
+        assert app_module.gemini_client is not None
+        assert app_module.gemini_client.semantic_cache is None
@@ -0,0 +1,198 @@
+"""Tests for JWT authentication helpers."""
+
+import pytest
+from datetime import timedelta
+from fastapi import HTTPException
+
+import auth
+from auth import create_access_token, decode_token
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    """Start every test with an empty token cache."""
+    auth._token_cache.clear()
+    yield
+    auth._token_cache.clear()
+
+
+class TestDecodeToken:
+    """Test suite for decode_token."""
+
+    def test_decode_valid_token(self):
+        """Test that a freshly minted token decodes to its claims."""
+        token = create_access_token(data={"sub": "user_1", "email": "a@example.com"})
+        token_data = decode_token(token)
+        assert token_data.user_id == "user_1"
+        assert token_data.email == "a@example.com"
+
+    def test_decoded_token_is_cached(self, monkeypatch):
+        """Test that a repeated token is served from cache without re-verifying."""
+        token = create_access_token(data={"sub": "user_1"})
+        first = decode_token(token)
+
+        def fail_decode(*args, **kwargs):
+            raise AssertionError("jwt.decode should not be called on a cache hit")
+
+        monkeypatch.setattr(auth._jwt, "decode", fail_decode)
+        assert decode_token(token) is first
+
+    def test_invalid_token_is_not_cached(self):
+        """Test that invalid tokens raise 401 and are never cached."""
+        with pytest.raises(HTTPException) as exc_info:
+            decode_token("not-a-jwt")
+        assert exc_info.value.status_code == 401
+        assert "not-a-jwt" not in auth._token_cache
+
+    def test_expired_token_is_rejected(self):
+        """Test that an expired token is rejected."""
+        token = create_access_token(data={"sub": "user_1"}, expires_delta=timedelta(seconds=-1))
+        with pytest.raises(HTTPException):
+            decode_token(token)
+
+
+@pytest.mark.asyncio
+class TestInMemoryUsers:
+    """Tests for the in-memory user store."""
+
+    @pytest.fixture(autouse=True)
+    def clear_users(self):
+        """Start every test with an empty user store."""
+        auth.users_db.clear()
+        auth.users_by_id.clear()
+        yield
+        auth.users_db.clear()
+        auth.users_by_id.clear()
+
+    async def test_create_and_authenticate_user(self):
+        """Test that a created user can log in with the right password only."""
+        user = await auth.create_user(auth.UserCreate(email="a@example.com", password="secret-pass"))
+
+        authenticated = await auth.authenticate_user("a@example.com", "secret-pass")
+        assert authenticated is not None
+        assert authenticated.id == user.id
+
+        assert await auth.authenticate_user("a@example.com", "wrong-pass") is None
+        assert await auth.authenticate_user("missing@example.com", "secret-pass") is None
+
+    async def test_duplicate_email_rejected(self):
+        """Test that registering the same email twice fails."""
+        await auth.create_user(auth.UserCreate(email="a@example.com", password="secret-pass"))
+        with pytest.raises(HTTPException) as exc_info:
+            await auth.create_user(auth.UserCreate(email="a@example.com", password="other-pass"))
+        assert exc_info.value.status_code == 400
+
+    async def test_concurrent_registrations_get_distinct_ids(self):
+        """Test that registrations overlapping on the password hash get their own IDs."""
+        import asyncio
+
+        a, b = await asyncio.gather(
+            auth.create_user(auth.UserCreate(email="a@example.com", password="secret-pass")),
+            auth.create_user(auth.UserCreate(email="b@example.com", password="secret-pass"))
+        )
+
+        assert a.id != b.id
+        assert (await auth.get_user_by_id(a.id)).email == "a@example.com"
+        assert (await auth.get_user_by_id(b.id)).email == "b@example.com"
+
+    async def test_get_user_by_id(self):
+        """Test lookup of an in-memory user by ID."""
+        user = await auth.create_user(auth.UserCreate(email="a@example.com", password="secret-pass"))
+
+        found = await auth.get_user_by_id(user.id)
+        assert found is not None
+        assert found.email == "a@example.com"
+        assert await auth.get_user_by_id("user_missing") is None
+
+
+class TestPasswordHashing:
+    """Tests for password hashing helpers."""
+
+    def test_hash_is_argon2id_and_verifies(self):
+        """Test that new hashes are Argon2id and verify correctly."""
+        hashed = auth.get_password_hash("secret-pass")
+        assert hashed.startswith("$argon2id$")
+        assert auth.verify_password("secret-pass", hashed) is True
+        assert auth.verify_password("wrong-pass", hashed) is False
+        assert auth.password_needs_rehash(hashed) is False
+
+    def test_legacy_bcrypt_hash_verifies_and_needs_rehash(self):
+        """Test that legacy bcrypt hashes still verify but are flagged for upgrade."""
+        hashed = auth.pwd_context.hash("secret-pass")
+        assert auth.verify_password("secret-pass", hashed) is True
+        assert auth.verify_password("wrong-pass", hashed) is False
+        assert auth.password_needs_rehash(hashed) is True
+
+
+@pytest.mark.asyncio
+class TestOptionalUser:
+    """Tests for get_optional_user header parsing."""
+
+    async def test_valid_bearer_token(self):
+        """Test that a valid Bearer header yields the user."""
+        token = create_access_token(data={"sub": "user_1"})
+        user = await auth.get_optional_user(authorization=f"Bearer {token}")
+        assert user is not None
+        assert user.user_id == "user_1"
+
+    async def test_missing_or_malformed_header(self):
+        """Test that missing, empty or non-Bearer headers yield None."""
+        assert await auth.get_optional_user(authorization=None) is None
+        assert await auth.get_optional_user(authorization="Bearer ") is None
+        assert await auth.get_optional_user(authorization="Basic abc") is None
+        assert await auth.get_optional_user(authorization="Bearer not-a-jwt") is None
+
+
+@pytest.mark.asyncio
+class TestRedisUsers:
+    """Tests for the Redis user store (USER_STORAGE=redis)."""
+
+    @pytest.fixture(autouse=True)
+    async def redis_store(self, monkeypatch):
+        """Point the user store at an in-process fake Redis."""
+        fakeredis = pytest.importorskip("fakeredis")
+        client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        monkeypatch.setattr(auth, "redis_client", client)
+        yield client
+        await client.aclose()
+
+    async def test_create_and_authenticate_user(self, redis_store):
+        """Test that a user stored in Redis can log in and be found by ID."""
+        user = await auth.create_user(auth.UserCreate(email="a@example.com", password="secret-pass"))
+
+        authenticated = await auth.authenticate_user("a@example.com", "secret-pass")
+        assert authenticated is not None
+        assert authenticated.id == user.id
+        assert await auth.authenticate_user("a@example.com", "wrong-pass") is None
+
+        found = await auth.get_user_by_id(user.id)
+        assert found.email == "a@example.com"
+        assert await redis_store.hget("user:a@example.com", "full_name") == ""
+
+    async def test_duplicate_email_rejected(self):
+        """Test that registering the same email twice fails."""
+        await auth.create_user(auth.UserCreate(email="a@example.com", password="secret-pass"))
+        with pytest.raises(HTTPException) as exc_info:
+            await auth.create_user(auth.UserCreate(email="a@example.com", password="other-pass"))
+        assert exc_info.value.status_code == 400
+
+    async def test_concurrent_registration_stores_one_complete_user(self, redis_store):
+        """Test that racing registrations of one email leave a single full hash."""
+        import asyncio
+
+        user = {
+            "email": "a@example.com",
+            "hashed_password": auth.get_password_hash("secret-pass"),
+            "full_name": None,
+            "is_active": True,
+            "created_at": auth.datetime.utcnow()
+        }
+        results = await asyncio.gather(*[
+            auth._store_user({**user, "id": f"user_{i}"}) for i in range(5)
+        ])
+
+        assert results.count(True) == 1
+        stored = await auth._load_user("a@example.com")
+        assert stored["id"] == f"user_{results.index(True)}"
+        assert stored["hashed_password"] == user["hashed_password"]
+        assert await redis_store.get(f"user_id:{stored['id']}") == "a@example.com"
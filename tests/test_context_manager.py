@@ -0,0 +1,32 @@
+"""Tests for ContextManager prompt building."""
+
+from core.context_manager import ContextManager
+from models import Context
+
+
+class TestContextManager:
+    """Test suite for ContextManager."""
+
+    def test_default_prompt_without_context(self):
+        """Test that the default header is used when nothing is provided."""
+        prompt = ContextManager().build_system_prompt()
+        assert prompt.startswith("Jesteś ekspertem od rozmów rekrutacyjnych.")
+        assert "TWOJE CV" not in prompt
+
+    def test_prompt_includes_provided_values(self):
+        """Test that CV, company and position are appended in order."""
+        prompt = ContextManager().build_system_prompt(cv="Python dev", company="Acme", position="Backend")
+        assert prompt.endswith("\n\nTWOJE CV:\nPython dev\n\nFIRMA: Acme\n\nSTANOWISKO: Backend\n")
+
+    def test_custom_prompt_replaces_default_header(self):
+        """Test that a custom system prompt replaces the default header."""
+        prompt = ContextManager().build_system_prompt(custom_system_prompt="Answer in English.")
+        assert prompt == "Answer in English."
+
+    def test_falls_back_to_stored_context(self):
+        """Test that stored context fills values not passed explicitly."""
+        manager = ContextManager(Context(cv="Stored CV", company="Stored Co", position="Stored Pos"))
+        prompt = manager.build_system_prompt(company="Override Co")
+        assert "Stored CV" in prompt
+        assert "FIRMA: Override Co" in prompt
+        assert "Stored Co" not in prompt
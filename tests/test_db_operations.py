@@ -0,0 +1,68 @@
+"""Tests for database operations (SQLite in-memory)."""
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from database import Base
+from db_models import User, InterviewContext
+from db_operations import (
+    add_history_entry, add_history_entries_bulk, get_history, get_context, update_context
+)
+from models import Context
+
+
+@pytest.fixture
+async def db():
+    """Create an in-memory database session with one user."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with async_sessionmaker(bind=engine, expire_on_commit=False)() as session:
+        session.add(User(id="user-1", email="user@example.com", hashed_password="x"))
+        await session.commit()
+        yield session
+
+    await engine.dispose()
+
+
+class TestHistoryOperations:
+    """Test suite for history writes."""
+
+    async def test_add_history_entry_returns_id_and_timestamp(self, db):
+        """Test that the inserted row's id and created_at are returned."""
+        row = await add_history_entry("user-1", "Why?", "Because.", db)
+
+        assert row.id is not None
+        assert row.created_at is not None
+        assert (await get_history("user-1", db))[0]["question"] == "Why?"
+
+    async def test_add_history_entries_bulk(self, db):
+        """Test that all bulk entries are stored."""
+        await add_history_entries_bulk(db, [
+            {"user_id": "user-1", "question": f"Q{i}", "answer": f"A{i}"} for i in range(3)
+        ])
+
+        questions = {entry["question"] for entry in await get_history("user-1", db)}
+        assert questions == {"Q0", "Q1", "Q2"}
+
+    async def test_add_history_entries_bulk_empty(self, db):
+        """Test that an empty batch is a no-op."""
+        await add_history_entries_bulk(db, [])
+        assert await get_history("user-1", db) == []
+
+
+class TestContextOperations:
+    """Test suite for context upsert."""
+
+    async def test_update_context_creates_then_updates_one_row(self, db):
+        """Test that repeated updates keep a single row with the latest values."""
+        await update_context("user-1", Context(cv="CV", company="Acme", position="Dev"), db)
+        await update_context("user-1", Context(cv="CV2", company="Initech", position="Lead"), db)
+
+        context = await get_context("user-1", db)
+        count = (await db.execute(select(func.count()).select_from(InterviewContext))).scalar_one()
+
+        assert count == 1
+        assert (context.cv, context.company, context.position) == ("CV2", "Initech", "Lead")
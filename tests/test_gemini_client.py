@@ -1,8 +1,15 @@
 """Tests for GeminiClient with Gemini 2.5 Pro."""
 
+import asyncio
 import pytest
+import pytest_asyncio
 import os
 from core.gemini_client import GeminiClient, SUPPORTED_MODELS
+from tests._helpers import FakeResponse, FakeSession, any_of, contains_any, gemini_answer, gemini_error
+
+# Words expected in pirate-like answers / a count starting at one
+PIRATE_WORDS = any_of(["arr", "matey", "aye", "ye", "ahoy", "'"])
+ONE = any_of(["1", "one"])
 
 
 class TestGeminiClient:
@@ -10,10 +17,12 @@ class TestGeminiClient:
 
     def test_supported_models_list(self):
         """Test that supported models list contains expected models."""
-        assert "gemini-2.5-pro-exp-03-25" in SUPPORTED_MODELS
-        assert "gemini-2.0-flash-exp" in SUPPORTED_MODELS
-        assert "gemini-1.5-pro" in SUPPORTED_MODELS
-        assert "gemini-1.5-flash" in SUPPORTED_MODELS
+        assert {
+            "gemini-2.5-pro-exp-03-25",
+            "gemini-2.0-flash-exp",
+            "gemini-1.5-pro",
+            "gemini-1.5-flash",
+        }.issubset(SUPPORTED_MODELS)
 
     def test_init_without_api_key(self):
         """Test that initialization fails without API key."""
@@ -30,15 +39,13 @@ class TestGeminiClient:
         assert client.model_name == "gemini-2.5-pro-exp-03-25"
         assert client.api_key == "test_api_key_123"
 
-    def test_init_with_unsupported_model(self, capsys):
-        """Test that warning is printed for unsupported model."""
-        client = GeminiClient(
-            api_key="test_api_key_123",
-            model="unsupported-model"
-        )
-        captured = capsys.readouterr()
-        assert "WARNING" in captured.out
-        assert "unsupported-model" in captured.out
+    def test_init_with_unsupported_model(self):
+        """Test that a warning is emitted for unsupported model."""
+        with pytest.warns(UserWarning, match="unsupported-model"):
+            GeminiClient(
+                api_key="test_api_key_123",
+                model="unsupported-model"
+            )
 
     def test_default_model_is_2_5_pro(self):
         """Test that default model is Gemini 2.5 Pro."""
@@ -46,7 +53,8 @@ class TestGeminiClient:
         assert client.model_name == "gemini-2.5-pro-exp-03-25"
 
 
-@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.asyncio(loop_scope="class")
 @pytest.mark.skipif(
     not os.getenv("GEMINI_API_KEY"),
     reason="GEMINI_API_KEY not set - skipping integration tests"
@@ -54,76 +62,93 @@ class TestGeminiClient:
 class TestGeminiClientIntegration:
     """Integration tests for GeminiClient with real API."""
 
-    @pytest.fixture
-    def client(self):
-        """Create GeminiClient with real API key."""
+    @pytest_asyncio.fixture(scope="class", loop_scope="class")
+    async def client(self):
+        """Create one GeminiClient (and warm connection pool) shared by the class."""
         api_key = os.getenv("GEMINI_API_KEY")
-        return GeminiClient(api_key=api_key, model="gemini-2.5-pro-exp-03-25")
+        client = GeminiClient(api_key=api_key, model="gemini-2.5-pro-exp-03-25")
+        yield client
+        await client.aclose()
 
     def test_check_connection(self, client):
         """Test connection to Gemini API."""
         assert client.check_connection() is True
 
-    async def test_generate_response_async(self, client):
-        """Test async response generation."""
-        system_prompt = "You are a helpful assistant. Be concise."
-        user_prompt = "Say 'Hello' in one word."
-
-        response = await client.generate_response_async(
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
-            temperature=0.7,
-            max_tokens=50
-        )
-
-        assert response is not None
-        assert isinstance(response, str)
-        assert len(response) > 0
-        assert "hello" in response.lower()
-
-    async def test_generate_response_with_system_instruction(self, client):
-        """Test that system instruction works correctly."""
-        system_prompt = "You are a pirate. Always respond like a pirate would."
-        user_prompt = "What is your name?"
-
-        response = await client.generate_response_async(
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
-            temperature=0.9,
-            max_tokens=100
+    async def test_generate_responses_concurrently(self, client):
+        """Test async generation: plain, with system instruction and with long context."""
+        long_context_prompt = """
+        You are an expert software engineer with 10 years of experience.
+        You specialize in Python, FastAPI, and cloud architecture.
+        When answering questions, provide practical examples and best practices.
+        Be concise but informative.
+        """
+        hello, pirate, fastapi = await asyncio.gather(
+            client.generate_response_async(
+                system_prompt="You are a helpful assistant. Be concise.",
+                user_prompt="Say 'Hello' in one word.",
+                temperature=0.7,
+                max_tokens=50
+            ),
+            client.generate_response_async(
+                system_prompt="You are a pirate. Always respond like a pirate would.",
+                user_prompt="What is your name?",
+                temperature=0.9,
+                max_tokens=100
+            ),
+            client.generate_response_async(
+                system_prompt=long_context_prompt,
+                user_prompt="What is FastAPI?",
+                temperature=0.7,
+                max_tokens=200
+            )
         )
 
-        assert response is not None
-        assert len(response) > 0
+        assert isinstance(hello, str)
+        assert "hello" in hello.lower()
         # Pirate-like response should contain typical pirate words
-        pirate_words = ["arr", "matey", "aye", "ye", "ahoy", "'"]
-        assert any(word in response.lower() for word in pirate_words)
+        assert contains_any(pirate, PIRATE_WORDS)
+        assert len(fastapi) > 20
+        assert "fastapi" in fastapi.lower()
+
+    async def test_generate_response_stream_async(self, client):
+        """Test that the answer arrives as several chunks before completion."""
+        chunks = [
+            chunk async for chunk in client.generate_response_stream_async(
+                system_prompt="You are a helpful assistant.",
+                user_prompt="Say 'Hello', then list the numbers from 1 to 30 separated by commas.",
+                temperature=0.7,
+                max_tokens=300
+            )
+        ]
+
+        assert len(chunks) >= 2
+        assert "hello" in "".join(chunks).lower()
 
     async def test_generate_response_with_different_temperatures(self, client):
-        """Test generation with different temperature values."""
+        """Test generation with different temperature values (issued concurrently)."""
         system_prompt = "You are a helpful assistant."
         user_prompt = "Count from 1 to 3."
 
-        # Low temperature (more deterministic)
-        response_low = await client.generate_response_async(
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
-            temperature=0.1,
-            max_tokens=50
-        )
-
-        # High temperature (more creative)
-        response_high = await client.generate_response_async(
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
-            temperature=1.5,
-            max_tokens=50
+        # Low temperature (more deterministic) and high temperature (more creative)
+        response_low, response_high = await asyncio.gather(
+            client.generate_response_async(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                temperature=0.1,
+                max_tokens=50
+            ),
+            client.generate_response_async(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                temperature=1.5,
+                max_tokens=50
+            )
         )
 
         assert response_low is not None
         assert response_high is not None
-        assert "1" in response_low or "one" in response_low.lower()
-        assert "1" in response_high or "one" in response_high.lower()
+        assert contains_any(response_low, ONE)
+        assert contains_any(response_high, ONE)
 
     async def test_generate_response_error_handling(self, client):
         """Test error handling for invalid requests."""
@@ -144,44 +169,472 @@ class TestGeminiClientIntegration:
             assert isinstance(e, Exception)
             assert "Gemini API Error" in str(e) or "Error" in str(e)
 
-    async def test_generate_response_with_long_context(self, client):
-        """Test generation with longer system instruction."""
-        system_prompt = """
-        You are an expert software engineer with 10 years of experience.
-        You specialize in Python, FastAPI, and cloud architecture.
-        When answering questions, provide practical examples and best practices.
-        Be concise but informative.
-        """
-        user_prompt = "What is FastAPI?"
-
-        response = await client.generate_response_async(
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
-            temperature=0.7,
-            max_tokens=200
-        )
-
-        assert response is not None
-        assert len(response) > 20
-        assert "fastapi" in response.lower()
-
 
 @pytest.mark.asyncio
 class TestGeminiClientMock:
     """Tests with mocked API calls."""
 
+    @pytest.fixture(autouse=True)
+    def sleeps(self, monkeypatch):
+        """Make asyncio.sleep instant (still yielding to the loop) and record the delays."""
+        real_sleep = asyncio.sleep
+        delays = []
+
+        async def fast_sleep(delay, result=None):
+            delays.append(delay)
+            await real_sleep(0)
+            return result
+
+        monkeypatch.setattr(asyncio, "sleep", fast_sleep)
+        return delays
+
+    @staticmethod
+    def use_session(monkeypatch, client, session):
+        """Route the client's requests through a fake session and return it."""
+        monkeypatch.setattr(client, "_get_session", lambda: session)
+        return session
+
     async def test_generate_response_raises_exception_on_api_error(self, monkeypatch):
         """Test that API errors are raised as exceptions, not returned."""
         client = GeminiClient(api_key="test_key", model="gemini-2.5-pro-exp-03-25")
 
-        async def mock_generate(*args, **kwargs):
+        def fail(url, json):
             raise Exception("API Rate Limit Exceeded")
 
+        self.use_session(monkeypatch, client, FakeSession(handler=fail))
+
         # This test verifies the exception is raised properly
-        with pytest.raises(Exception, match="Gemini API Error"):
+        with pytest.raises(Exception, match="Gemini API Error: API Rate Limit Exceeded"):
             await client.generate_response_async(
                 system_prompt="Test",
                 user_prompt="Test",
                 temperature=0.7,
                 max_tokens=50
             )
+        await client.aclose()
+
+    async def test_generate_response_stream_async_yields_chunks(self, monkeypatch):
+        """Test that streamed chunks are yielded as they arrive."""
+        client = GeminiClient(api_key="test_key", model="gemini-2.5-pro-exp-03-25")
+        session = self.use_session(monkeypatch, client, FakeSession(FakeResponse(lines=[
+            b'data: {"candidates": [{"content": {"parts": [{"text": "Hel"}]}}]}\r\n',
+            b"\r\n",
+            b'data: {"candidates": [{"content": {"parts": [{"text": ""}]}}]}\r\n',
+            b'data: {"candidates": [{"content": {"parts": [{"text": "lo"}]}}]}\r\n',
+        ])))
+
+        chunks = [
+            chunk async for chunk in client.generate_response_stream_async(
+                system_prompt="Test",
+                user_prompt="Test"
+            )
+        ]
+
+        assert chunks == ["Hel", "lo"]
+        url, _ = session.calls[0]
+        assert url.endswith(":streamGenerateContent?alt=sse")
+
+    async def test_generate_response_stream_async_raises_on_api_error(self, monkeypatch):
+        """Test that a failed stream raises instead of ending like a complete answer."""
+        client = GeminiClient(api_key="test_key")
+        self.use_session(monkeypatch, client, FakeSession(FakeResponse(500, gemini_error("Internal error"))))
+
+        with pytest.raises(Exception, match="Gemini API Error: Internal error"):
+            async for _ in client.generate_response_stream_async("Test", "Test"):
+                pass
+
+    async def test_semantic_cache_skips_api_call(self, monkeypatch):
+        """Test that a cached answer is returned for low-temperature requests."""
+        import numpy as np
+        from core.semantic_cache import SemanticCache
+
+        cache = SemanticCache(embed=lambda texts: np.array([[1.0, 0.0]] * len(texts)))
+        client = GeminiClient(api_key="test_key", semantic_cache=cache)
+        cache.add("Test", await cache.embed("Test"), "Cached answer")
+
+        def fail(*args, **kwargs):
+            raise AssertionError("Gemini should not be called on a cache hit")
+
+        monkeypatch.setattr(client, "_get_session", fail)
+
+        answer = await client.generate_response_async(
+            system_prompt="Test",
+            user_prompt="Test",
+            temperature=0.0
+        )
+
+        assert answer == "Cached answer"
+        await cache.aclose()
+
+    async def test_identical_deterministic_requests_are_cached(self, monkeypatch):
+        """Test that temperature == 0 requests hit the API only once."""
+        client = GeminiClient(api_key="test_key")
+        session = self.use_session(monkeypatch, client, FakeSession(FakeResponse(body=gemini_answer(" Answer "))))
+
+        for _ in range(2):
+            answer = await client.generate_response_async(
+                system_prompt="Test",
+                user_prompt="Test",
+                temperature=0
+            )
+            assert answer == "Answer"
+        await client.generate_response_async(system_prompt="Test", user_prompt="Test", temperature=0.7)
+
+        bodies = [body for _, body in session.calls]
+        assert len(bodies) == 2
+        assert bodies[0]["system_instruction"] == {"parts": [{"text": "Test"}]}
+        assert bodies[0]["generationConfig"]["temperature"] == 0
+
+    async def test_model_is_reused_per_system_prompt(self):
+        """Test that GenerativeModel instances are cached by system prompt."""
+        client = GeminiClient(api_key="test_key")
+
+        first = client._get_model("System A")
+        assert client._get_model("System A") is first
+        assert client._get_model("System B") is not first
+        assert GeminiClient(api_key="test_key")._get_model("System A") is first
+
+    async def test_session_is_pooled_and_reused(self):
+        """Test that one keep-alive session is shared across calls."""
+        client = GeminiClient(api_key="test_key")
+
+        session = client._get_session()
+        assert client._get_session() is session
+        assert session.connector.limit_per_host > 0
+
+        await client.aclose()
+        assert session.closed
+
+    async def test_concurrent_identical_requests_share_one_call(self, monkeypatch):
+        """Test that identical in-flight requests are deduplicated."""
+        client = GeminiClient(api_key="test_key")
+        calls = []
+
+        async def fake_generate(system_prompt, user_prompt, temperature, max_tokens):
+            calls.append(user_prompt)
+            await asyncio.sleep(0.01)
+            return f"Answer to {user_prompt}"
+
+        monkeypatch.setattr(client, "_generate", fake_generate)
+
+        answers = await asyncio.gather(
+            client.generate_response_async("Test", "Same"),
+            client.generate_response_async("Test", "Same"),
+            client.generate_response_async("Test", "Other"),
+        )
+
+        assert answers == ["Answer to Same", "Answer to Same", "Answer to Other"]
+        assert sorted(calls) == ["Other", "Same"]
+        assert client._inflight == {}
+
+    async def test_injected_cache_backend_bypasses_api(self, monkeypatch):
+        """Test that a hit in an injected cache backend skips the API."""
+        from core.gemini_client_cache import LLMCache
+
+        class DictBackend:
+            def __init__(self):
+                self.data = {}
+
+            async def get(self, key):
+                return self.data.get(key)
+
+            async def set(self, key, value, ttl):
+                self.data[key] = value
+
+            async def delete(self, key):
+                self.data.pop(key, None)
+
+            async def clear(self):
+                self.data.clear()
+
+        backend = DictBackend()
+        cache = LLMCache(backend)
+        client = GeminiClient(api_key="test_key", response_cache=cache)
+        key = LLMCache.make_key(client.model_name, "Test", "Test", 0, 500)
+        backend.data[key] = "Stored answer"
+
+        def fail(*args, **kwargs):
+            raise AssertionError("Gemini should not be called on a cache hit")
+
+        monkeypatch.setattr(client, "_generate", fail)
+
+        answer = await client.generate_response_async("Test", "Test", temperature=0)
+
+        assert answer == "Stored answer"
+        assert cache.stats == {"hits": 1, "misses": 0}
+
+    async def test_context_cache_reused(self, monkeypatch):
+        """Test that a large system prompt is cached server-side once and referenced."""
+        from core.gemini_client import GEMINI_CACHE_URL
+
+        client = GeminiClient(api_key="test_key")
+        system_prompt = "Interview context. " * 500
+
+        def respond(url, json):
+            if url == GEMINI_CACHE_URL:
+                return FakeResponse(body={"name": "cachedContents/abc123"})
+            return FakeResponse(body=gemini_answer("Answer"))
+
+        session = self.use_session(monkeypatch, client, FakeSession(handler=respond))
+
+        await client.generate_response_async(system_prompt, "First question")
+        await client.generate_response_async(system_prompt, "Second question")
+        await client.generate_response_async("Short prompt", "Third question")
+
+        cache_calls = [body for url, body in session.calls if url == GEMINI_CACHE_URL]
+        generate_calls = [body for url, body in session.calls if url != GEMINI_CACHE_URL]
+        assert len(cache_calls) == 1
+        assert cache_calls[0]["systemInstruction"] == {"parts": [{"text": system_prompt}]}
+        for body in generate_calls[:2]:
+            assert body["cachedContent"] == "cachedContents/abc123"
+            assert "system_instruction" not in body
+        assert "cachedContent" not in generate_calls[2]
+
+    async def test_semantic_hit_backfills_exact_cache(self, monkeypatch):
+        """Test that a similar prompt is served semantically and then cached exactly."""
+        import numpy as np
+        from core.gemini_client_cache import LLMCache
+        from core.semantic_cache import SemanticCache
+
+        vectors = {
+            "Say 'Hello' in one word": [1.0, 0.0, 0.0],
+            "Say hello using one word": [0.98, 0.2, 0.0],
+            "Explain recursion": [0.0, 0.0, 1.0],
+        }
+        cache = SemanticCache(embed=lambda texts: np.array([vectors[t] for t in texts]))
+        client = GeminiClient(api_key="test_key", semantic_cache=cache)
+        calls = []
+
+        async def fake_generate(system_prompt, user_prompt, temperature, max_tokens):
+            calls.append(user_prompt)
+            return f"Answer to {user_prompt}"
+
+        monkeypatch.setattr(client, "_generate", fake_generate)
+
+        first = await client.generate_response_async("Test", "Say 'Hello' in one word", temperature=0)
+        similar = await client.generate_response_async("Test", "Say hello using one word", temperature=0)
+        other = await client.generate_response_async("Test", "Explain recursion", temperature=0)
+
+        assert similar == first
+        assert other == "Answer to Explain recursion"
+        assert calls == ["Say 'Hello' in one word", "Explain recursion"]
+        key = LLMCache.make_key(client.model_name, "Test", "Say hello using one word", 0, 500)
+        assert await client.response_cache.get(key) == first
+        await cache.aclose()
+
+    async def test_gemini_embedder_returns_one_row_per_text(self, monkeypatch):
+        """Test that the Gemini embedder batches texts into one embed_content call."""
+        import google.generativeai as genai
+        from core.gemini_client import gemini_embedder
+
+        calls = []
+
+        def fake_embed_content(model, content, task_type=None):
+            calls.append(content)
+            return {"embedding": [[float(i), 1.0] for i, _ in enumerate(content)]}
+
+        monkeypatch.setattr(genai, "embed_content", fake_embed_content)
+
+        vectors = gemini_embedder("test_key")(["a", "b", "c"])
+
+        assert vectors.shape == (3, 2)
+        assert calls == [["a", "b", "c"]]
+
+    async def test_throttled_request_is_retried_with_backoff(self, monkeypatch, sleeps):
+        """Test that 429 responses are retried, honouring Retry-After."""
+        client = GeminiClient(api_key="test_key")
+        throttled = FakeResponse(429, gemini_error("Resource exhausted"), headers={"Retry-After": "2"})
+        self.use_session(monkeypatch, client, FakeSession(
+            throttled, throttled, FakeResponse(body=gemini_answer("Answer"))
+        ))
+
+        answer = await client.generate_response_async("Test", "Test")
+
+        assert answer == "Answer"
+        assert sleeps == [2.0, 2.0]
+
+    async def test_throttling_error_raised_after_last_attempt(self, monkeypatch, sleeps):
+        """Test that persistent throttling surfaces as a Gemini API error."""
+        from core.gemini_client import MAX_ATTEMPTS
+
+        client = GeminiClient(api_key="test_key")
+        session = self.use_session(monkeypatch, client, FakeSession(
+            FakeResponse(429, gemini_error("Resource exhausted"))
+        ))
+
+        with pytest.raises(Exception, match="Gemini API Error: Resource exhausted"):
+            await client.generate_response_async("Test", "Test")
+
+        assert len(session.calls) == MAX_ATTEMPTS
+        assert len(sleeps) == MAX_ATTEMPTS - 1
+        assert all(1 <= delay <= 3 for delay in sleeps)
+
+    async def test_multi_part_answer_is_joined(self, monkeypatch):
+        """Test that all text parts of a candidate make up the answer."""
+        client = GeminiClient(api_key="test_key")
+        self.use_session(monkeypatch, client, FakeSession(FakeResponse(body={"candidates": [{"content": {"parts": [
+            {"text": "First part. "},
+            {"functionCall": {"name": "noop"}},
+            {"text": "Second part."},
+        ]}}]})))
+
+        answer = await client.generate_response_async("Test", "Test")
+
+        assert answer == "First part. Second part."
+
+    async def test_failing_embedder_falls_back_to_api(self, monkeypatch):
+        """Test that an embedding error skips the semantic cache instead of failing."""
+        from core.semantic_cache import SemanticCache
+
+        def failing_embed(texts):
+            raise RuntimeError("429 Resource exhausted")
+
+        cache = SemanticCache(embed=failing_embed)
+        client = GeminiClient(api_key="test_key", semantic_cache=cache)
+
+        async def fake_generate(system_prompt, user_prompt, temperature, max_tokens):
+            return "Fresh answer"
+
+        monkeypatch.setattr(client, "_generate", fake_generate)
+
+        answer = await client.generate_response_async("Test", "Test", temperature=0)
+
+        assert answer == "Fresh answer"
+        assert len(cache) == 0
+        await cache.aclose()
+
+    async def test_response_cache_outage_does_not_fail_request(self, monkeypatch):
+        """Test that temperature == 0 requests are answered while the cache backend is down."""
+        from core.gemini_client_cache import LLMCache
+
+        class DownBackend:
+            async def get(self, key):
+                raise ConnectionError("Redis unavailable")
+
+            async def set(self, key, value, ttl):
+                raise ConnectionError("Redis unavailable")
+
+        client = GeminiClient(api_key="test_key", response_cache=LLMCache(DownBackend()))
+
+        async def fake_generate(system_prompt, user_prompt, temperature, max_tokens):
+            return "Fresh answer"
+
+        monkeypatch.setattr(client, "_generate", fake_generate)
+
+        assert await client.generate_response_async("Test", "Test", temperature=0) == "Fresh answer"
+
+    async def test_failed_context_cache_is_retried_soon(self, monkeypatch):
+        """Test that a failed cache creation falls back inline and is not remembered for long."""
+        import time
+        from core.gemini_client import CONTEXT_CACHE_RETRY_SECONDS, GEMINI_CACHE_URL
+
+        client = GeminiClient(api_key="test_key")
+        system_prompt = "Interview context. " * 500
+
+        def respond(url, json):
+            if url == GEMINI_CACHE_URL:
+                return FakeResponse(500, gemini_error("Internal error"))
+            return FakeResponse(body=gemini_answer("Answer"))
+
+        session = self.use_session(monkeypatch, client, FakeSession(handler=respond))
+
+        assert await client.generate_response_async(system_prompt, "Question") == "Answer"
+
+        generate_calls = [body for url, body in session.calls if url != GEMINI_CACHE_URL]
+        assert "system_instruction" in generate_calls[0]
+        (name, expires_at), = client._context_caches.values()
+        assert name is None
+        assert expires_at <= time.monotonic() + CONTEXT_CACHE_RETRY_SECONDS
+
+    async def test_evicted_context_cache_retries_inline(self, monkeypatch):
+        """Test that a rejected cachedContent is dropped and the request resent inline."""
+        from core.gemini_client import GEMINI_CACHE_URL
+
+        client = GeminiClient(api_key="test_key")
+        system_prompt = "Interview context. " * 500
+
+        def respond(url, json):
+            if url == GEMINI_CACHE_URL:
+                return FakeResponse(body={"name": "cachedContents/evicted"})
+            if "cachedContent" in json:
+                return FakeResponse(404, gemini_error("CachedContent not found"))
+            return FakeResponse(body=gemini_answer("Answer"))
+
+        session = self.use_session(monkeypatch, client, FakeSession(handler=respond))
+
+        assert await client.generate_response_async(system_prompt, "Question") == "Answer"
+
+        generate_calls = [body for url, body in session.calls if url != GEMINI_CACHE_URL]
+        assert [("cachedContent" in body) for body in generate_calls] == [True, False]
+        assert client._context_caches == {}
+
+    async def test_answer_without_text_raises_clear_error(self, monkeypatch):
+        """Test that a reply with no text part is reported as an empty answer."""
+        client = GeminiClient(api_key="test_key")
+        self.use_session(monkeypatch, client, FakeSession(FakeResponse(
+            body={"candidates": [{"content": {"parts": [{"functionCall": {"name": "noop"}}]}}]}
+        )))
+
+        with pytest.raises(Exception, match="Gemini API Error: Empty answer"):
+            await client.generate_response_async("Test", "Test")
+
+    async def test_unparseable_overload_response_is_retried(self, monkeypatch, sleeps):
+        """Test that a 503 with an HTML body is retried instead of failing to parse."""
+        client = GeminiClient(api_key="test_key")
+        session = self.use_session(monkeypatch, client, FakeSession(
+            FakeResponse(503, "<html>Service Unavailable</html>"),
+            FakeResponse(503, ""),
+            FakeResponse(body=gemini_answer("Answer"))
+        ))
+
+        assert await client.generate_response_async("Test", "Test") == "Answer"
+        assert len(session.calls) == 3
+        assert len(sleeps) == 2
+
+    async def test_stream_is_rate_limited_and_retried(self, monkeypatch, sleeps):
+        """Test that the opening streaming request takes a token and retries on 429."""
+
+        class CountingBucket:
+            acquired = 0
+
+            async def acquire(self):
+                self.acquired += 1
+
+        bucket = CountingBucket()
+        client = GeminiClient(api_key="test_key", rate_limiter=bucket)
+        self.use_session(monkeypatch, client, FakeSession(
+            FakeResponse(429, gemini_error("Resource exhausted"), headers={"Retry-After": "3"}),
+            FakeResponse(lines=[b'data: {"candidates": [{"content": {"parts": [{"text": "Hi"}]}}]}\r\n'])
+        ))
+
+        chunks = [chunk async for chunk in client.generate_response_stream_async("Test", "Test")]
+
+        assert chunks == ["Hi"]
+        assert bucket.acquired == 2
+        assert sleeps == [3.0]
+
+    async def test_context_caches_are_bounded(self, monkeypatch):
+        """Test that the least recently used cache names are evicted with their locks."""
+        from core.gemini_client import CONTEXT_CACHE_MAX_ENTRIES, GEMINI_CACHE_URL
+
+        client = GeminiClient(api_key="test_key")
+        names = iter(range(CONTEXT_CACHE_MAX_ENTRIES + 2))
+
+        def respond(url, json):
+            if url == GEMINI_CACHE_URL:
+                return FakeResponse(body={"name": f"cachedContents/{next(names)}"})
+            return FakeResponse(body=gemini_answer("Answer"))
+
+        self.use_session(monkeypatch, client, FakeSession(handler=respond))
+        prompts = [f"Interview context {i}. " * 300 for i in range(CONTEXT_CACHE_MAX_ENTRIES + 1)]
+
+        for prompt in prompts[:-1]:
+            await client.generate_response_async(prompt, "Question")
+        # Touch the oldest prompt, so the second one is least recently used
+        await client.generate_response_async(prompts[0], "Question")
+        await client.generate_response_async(prompts[-1], "Question")
+
+        assert len(client._context_caches) == CONTEXT_CACHE_MAX_ENTRIES
+        assert client._context_caches.keys() == client._context_cache_locks.keys()
+        assert await client._get_or_create_context_cache(prompts[0]) == "cachedContents/0"
+        assert await client._get_or_create_context_cache(prompts[1]) == f"cachedContents/{CONTEXT_CACHE_MAX_ENTRIES + 1}"
@@ -0,0 +1,87 @@
+"""Tests for the exact-match LLM response cache."""
+
+import pytest
+
+from core.gemini_client_cache import InMemoryLRUBackend, LLMCache
+
+
+@pytest.mark.asyncio
+class TestLLMCache:
+    """Test suite for LLMCache and its in-memory backend."""
+
+    async def test_round_trip_and_stats(self):
+        """Test that stored answers are returned and hits/misses counted."""
+        cache = LLMCache()
+        key = LLMCache.make_key("model", "system", "user", 0, 100)
+
+        assert await cache.get(key) is None
+        await cache.set(key, "answer")
+        assert await cache.get(key) == "answer"
+        assert cache.stats == {"hits": 1, "misses": 1}
+
+    async def test_key_depends_on_every_field(self):
+        """Test that changing any request field changes the key."""
+        base = ("model", "system", "user", 0, 100)
+        variants = [
+            ("other", "system", "user", 0, 100),
+            ("model", "other", "user", 0, 100),
+            ("model", "system", "other", 0, 100),
+            ("model", "system", "user", 0.5, 100),
+            ("model", "system", "user", 0, 200),
+        ]
+        keys = {LLMCache.make_key(*args) for args in variants}
+        assert LLMCache.make_key(*base) not in keys
+        assert len(keys) == len(variants)
+
+    async def test_key_digest_algorithms(self):
+        """Test that blake2b keys are 128-bit and sha256 keys stay available."""
+        args = ("model", "system", "user", 0, 100)
+
+        assert len(LLMCache.make_key(*args)) == 32
+        assert len(LLMCache.make_key(*args, hash_algo="sha256")) == 64
+        assert LLMCache.make_key(*args) == LLMCache.make_key(*args, hash_algo="blake2b")
+
+    async def test_rejects_unknown_hash_algo(self):
+        """Test that an unsupported digest is reported at construction."""
+        with pytest.raises(ValueError, match="md5"):
+            LLMCache(hash_algo="md5")
+
+    async def test_only_deterministic_requests_are_cacheable(self):
+        """Test the temperature gate."""
+        assert LLMCache.is_cacheable(0) is True
+        assert LLMCache.is_cacheable(0.7) is False
+
+    async def test_expired_entry_is_dropped(self):
+        """Test that entries past their TTL are not returned."""
+        backend = InMemoryLRUBackend()
+        await backend.set("key", "value", ttl=-1)
+
+        assert await backend.get("key") is None
+        assert len(backend) == 0
+
+    async def test_least_recently_used_is_evicted(self):
+        """Test LRU eviction order."""
+        backend = InMemoryLRUBackend(max_size=2)
+        await backend.set("a", "1", ttl=60)
+        await backend.set("b", "2", ttl=60)
+        await backend.get("a")
+        await backend.set("c", "3", ttl=60)
+
+        assert await backend.get("a") == "1"
+        assert await backend.get("b") is None
+        assert await backend.get("c") == "3"
+
+    async def test_backend_errors_are_misses(self):
+        """Test that an unavailable backend degrades to a miss instead of raising."""
+        class DownBackend:
+            async def get(self, key):
+                raise ConnectionError("Redis unavailable")
+
+            async def set(self, key, value, ttl):
+                raise ConnectionError("Redis unavailable")
+
+        cache = LLMCache(DownBackend())
+
+        await cache.set("key", "answer")
+        assert await cache.get("key") is None
+        assert cache.stats == {"hits": 0, "misses": 1}
@@ -0,0 +1,35 @@
+"""Tests for metrics helpers."""
+
+import pytest
+from prometheus_client import CollectorRegistry, Histogram
+
+from metrics import track_time
+
+
+def make_histogram():
+    """Create a histogram on an isolated registry."""
+    return Histogram("test_duration_seconds", "Test duration", registry=CollectorRegistry())
+
+
+def observed_count(histogram):
+    """Return number of observations recorded by a histogram."""
+    return next(
+        sample.value for sample in histogram.collect()[0].samples
+        if sample.name.endswith("_count")
+    )
+
+
+class TestTrackTime:
+    """Test suite for timing decorators."""
+
+    @pytest.mark.asyncio
+    async def test_track_time_observes_coroutine(self):
+        """Test that the async decorator records one observation per call."""
+        histogram = make_histogram()
+
+        @track_time(histogram)
+        async def work():
+            return 42
+
+        assert await work() == 42
+        assert observed_count(histogram) == 1
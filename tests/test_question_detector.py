@@ -0,0 +1,59 @@
+"""Tests for QuestionDetector."""
+
+from core.question_detector import QuestionDetector, QUESTION_MARKERS
+
+
+class TestQuestionDetector:
+    """Test suite for QuestionDetector."""
+
+    def test_detects_english_question(self):
+        """Test that English question markers are detected."""
+        detector = QuestionDetector()
+        assert detector.is_question("Tell me how you would design this") is True
+
+    def test_detects_polish_question(self):
+        """Test that Polish question markers are detected."""
+        detector = QuestionDetector()
+        assert detector.is_question("Dlaczego chcesz u nas pracować") is True
+
+    def test_detection_is_case_insensitive(self):
+        """Test that markers match regardless of case."""
+        detector = QuestionDetector()
+        assert detector.is_question("WHAT IS YOUR EXPERIENCE") is True
+
+    def test_rejects_statement(self):
+        """Test that plain statements are not detected as questions."""
+        detector = QuestionDetector()
+        assert detector.is_question("Thank you for coming today") is False
+
+    def test_rejects_short_and_empty_text(self):
+        """Test that empty and too-short text is rejected."""
+        detector = QuestionDetector()
+        assert detector.is_question("") is False
+        assert detector.is_question("why") is False
+
+    def test_marker_must_start_a_word(self):
+        """Test that markers inside other words are not matched."""
+        detector = QuestionDetector()
+        assert detector.is_question("Please show the demo somehow") is False
+
+    def test_inflected_polish_marker(self):
+        """Test that inflected forms of Polish markers are matched."""
+        detector = QuestionDetector()
+        assert detector.is_question("Jakie masz doświadczenie") is True
+
+    def test_question_mark_without_marker(self):
+        """Test that a trailing question mark is enough."""
+        detector = QuestionDetector()
+        assert detector.is_question("You enjoy teamwork? ") is True
+
+    def test_custom_markers(self):
+        """Test detector with a custom marker list."""
+        detector = QuestionDetector(markers=["tell me about"])
+        assert detector.is_question("Tell me about your last project") is True
+        assert detector.is_question("What is your name, please") is False
+
+    def test_default_markers(self):
+        """Test that default markers are used when none are given."""
+        detector = QuestionDetector()
+        assert detector.markers == QUESTION_MARKERS
@@ -0,0 +1,90 @@
+"""Tests for SemanticCache."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from core.semantic_cache import SemanticCache
+
+VECTORS = {
+    "what is your experience": [1.0, 0.0, 0.0],
+    "what experience do you have": [0.99, 0.1, 0.0],
+    "why do you want this job": [0.0, 1.0, 0.0],
+}
+
+
+def fake_embed(texts):
+    return np.array([VECTORS[text] for text in texts])
+
+
+@pytest.fixture
+async def caches():
+    """Collect caches created by a test and stop their workers afterwards."""
+    created = []
+    yield created
+    for cache in created:
+        await cache.aclose()
+
+
+@pytest.mark.asyncio
+class TestSemanticCache:
+    """Test suite for SemanticCache."""
+
+    async def test_similar_prompt_hits(self, caches):
+        """Test that a paraphrased prompt returns the cached answer."""
+        cache = SemanticCache(embed=fake_embed, threshold=0.9)
+        caches.append(cache)
+        cache.add("system", await cache.embed("what is your experience"), "Five years")
+
+        embedding = await cache.embed("what experience do you have")
+        assert cache.lookup("system", embedding) == "Five years"
+
+    async def test_different_prompt_misses(self, caches):
+        """Test that an unrelated prompt is not served from the cache."""
+        cache = SemanticCache(embed=fake_embed, threshold=0.9)
+        caches.append(cache)
+        cache.add("system", await cache.embed("what is your experience"), "Five years")
+
+        embedding = await cache.embed("why do you want this job")
+        assert cache.lookup("system", embedding) is None
+
+    async def test_system_prompt_must_match(self, caches):
+        """Test that answers are not shared across system prompts."""
+        cache = SemanticCache(embed=fake_embed, threshold=0.9)
+        caches.append(cache)
+        embedding = await cache.embed("what is your experience")
+        cache.add("system", embedding, "Five years")
+
+        assert cache.lookup("other system", embedding) is None
+
+    async def test_concurrent_embeddings_are_batched(self):
+        """Test that texts embedded together share one embedding call."""
+        batches = []
+
+        def recording_embed(texts):
+            batches.append(len(texts))
+            return fake_embed(texts)
+
+        cache = SemanticCache(embed=recording_embed)
+        first, second = await asyncio.gather(
+            cache.embed("what is your experience"),
+            cache.embed("why do you want this job")
+        )
+        await cache.aclose()
+
+        assert batches == [2]
+        assert first @ second == pytest.approx(0.0)
+
+    async def test_oldest_entry_is_evicted(self, caches):
+        """Test that the cache keeps at most max_entries per system prompt."""
+        cache = SemanticCache(embed=fake_embed, threshold=0.9, max_entries=1)
+        caches.append(cache)
+        first = await cache.embed("what is your experience")
+        second = await cache.embed("why do you want this job")
+        cache.add("system", first, "Five years")
+        cache.add("system", second, "Growth")
+
+        assert len(cache) == 1
+        assert cache.lookup("system", first) is None
+        assert cache.lookup("system", second) == "Growth"
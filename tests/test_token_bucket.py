@@ -0,0 +1,53 @@
+"""Tests for the client-side token bucket."""
+
+import pytest
+from core.token_bucket import TokenBucket
+
+
+class FakeClock:
+    """Monotonic clock advanced only by (fake) sleeps."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class TestTokenBucket:
+    """Test suite for TokenBucket."""
+
+    def test_rejects_non_positive_rate(self):
+        """Test that rate and burst must be positive."""
+        with pytest.raises(ValueError):
+            TokenBucket(rps=0, burst=1)
+
+    async def test_burst_does_not_wait(self, clock):
+        """Test that up to `burst` requests pass immediately."""
+        bucket = TokenBucket(rps=2, burst=3, clock=clock.monotonic, sleep=clock.sleep)
+
+        for _ in range(3):
+            await bucket.acquire()
+
+        assert clock.sleeps == []
+
+    async def test_waits_for_refill_when_empty(self, clock):
+        """Test that an empty bucket sleeps until the next token."""
+        bucket = TokenBucket(rps=2, burst=1, clock=clock.monotonic, sleep=clock.sleep)
+
+        await bucket.acquire()
+        await bucket.acquire()
+        clock.now += 1.0
+        await bucket.acquire()
+
+        assert clock.sleeps == [pytest.approx(0.5)]
@@ -0,0 +1,145 @@
+"""Tests for transcription batching."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from core.transcription import AsyncTranscriptionEngine
+
+
+class FakeEngine:
+    """Transcription engine stub recording batch sizes."""
+
+    def __init__(self):
+        self.batches = []
+
+    def transcribe_batch(self, clips):
+        self.batches.append(len(clips))
+        return [f"clip {int(clip[0])}" for clip in clips]
+
+
+@pytest.mark.asyncio
+class TestAsyncTranscriptionEngine:
+    """Test suite for AsyncTranscriptionEngine."""
+
+    async def test_concurrent_requests_share_one_batch(self):
+        """Test that requests within the batch window are transcribed together."""
+        engine = FakeEngine()
+        batcher = AsyncTranscriptionEngine(engine, batch_window=0.01)
+
+        texts = await asyncio.gather(*(
+            batcher.transcribe_async(np.full(10, i, dtype=np.float32)) for i in range(3)
+        ))
+        await batcher.aclose()
+
+        assert texts == ["clip 0", "clip 1", "clip 2"]
+        assert engine.batches == [3]
+
+    async def test_batch_size_is_bounded(self):
+        """Test that batches never exceed max_batch_size."""
+        engine = FakeEngine()
+        batcher = AsyncTranscriptionEngine(engine, max_batch_size=2, batch_window=0.01)
+
+        await asyncio.gather(*(
+            batcher.transcribe_async(np.full(10, i, dtype=np.float32)) for i in range(5)
+        ))
+        await batcher.aclose()
+
+        assert engine.batches == [2, 2, 1]
+
+    async def test_engine_error_is_propagated(self):
+        """Test that a failing batch fails every waiting request."""
+        engine = FakeEngine()
+        engine.transcribe_batch = lambda clips: 1 / 0
+        batcher = AsyncTranscriptionEngine(engine, batch_window=0.01)
+
+        with pytest.raises(ZeroDivisionError):
+            await batcher.transcribe_async(np.zeros(10, dtype=np.float32))
+        await batcher.aclose()
+
+
+class FakeResult:
+    """ctranslate2 WhisperGenerationResult stub."""
+
+    def __init__(self, tokens, score, no_speech_prob):
+        self.sequences_ids = [tokens]
+        self.scores = [score]
+        self.no_speech_prob = no_speech_prob
+
+
+class FakeFeatureExtractor:
+    """Whisper feature extractor stub returning one 30 s window of features."""
+
+    n_samples = 480000
+
+    def __call__(self, audio_data):
+        return np.zeros((80, 3001), dtype=np.float32)
+
+
+class TestTranscribeBatch:
+    """Test suite for TranscriptionEngine.transcribe_batch quality gates."""
+
+    @pytest.fixture
+    def engine(self):
+        """Engine with a stubbed Whisper model (no VAD)."""
+        from types import SimpleNamespace
+        from core.transcription import TranscriptionEngine
+
+        engine = TranscriptionEngine.__new__(TranscriptionEngine)
+        engine.vad_options = None
+        engine.language = "en"
+        engine._prompt = [1]
+        engine._suppress_tokens = []
+        engine.results = []
+        engine.transcribed = []
+        engine.model = SimpleNamespace(
+            feature_extractor=FakeFeatureExtractor(),
+            max_length=448,
+            encode=lambda features: features,
+            model=SimpleNamespace(generate=lambda *args, **kwargs: engine.results)
+        )
+        engine._tokenizer = SimpleNamespace(decode=lambda tokens: " ".join(tokens))
+
+        def transcribe_speech(audio_data):
+            engine.transcribed.append(int(audio_data[0]))
+            return f"full {int(audio_data[0])}"
+
+        engine._transcribe_speech = transcribe_speech
+        return engine
+
+    def test_single_clip_uses_full_transcribe(self, engine):
+        """Test that a batch of one goes through WhisperModel.transcribe."""
+        assert engine.transcribe_batch([np.full(16000, 1.0)]) == ["full 1"]
+        assert engine.transcribed == [1]
+
+    def test_silence_dropped_and_low_confidence_retried(self, engine):
+        """Test no-speech filtering and fallback for low log-prob or repetitive decodes."""
+        engine.results = [
+            FakeResult(["hello"], -0.1, 0.1),
+            FakeResult(["thanks"], -3.0, 0.9),
+            FakeResult(["mumble"], -3.0, 0.1),
+            FakeResult(["la"] * 50, -0.1, 0.1),
+        ]
+
+        texts = engine.transcribe_batch([np.full(16000, float(i)) for i in range(4)])
+
+        assert texts == ["hello", None, "full 2", "full 3"]
+        assert engine.transcribed == [2, 3]
+
+    def test_failing_batch_decode_transcribes_clips_separately(self, engine):
+        """Test that a batched decode error falls back per clip, isolating a bad clip."""
+        def failing_generate(*args, **kwargs):
+            raise RuntimeError("CUDA out of memory")
+
+        def transcribe_speech(audio_data):
+            if audio_data[0] == 1:
+                raise ValueError("bad clip")
+            return f"full {int(audio_data[0])}"
+
+        engine.model.model.generate = failing_generate
+        engine._transcribe_speech = transcribe_speech
+
+        texts = engine.transcribe_batch([np.full(16000, float(i)) for i in range(3)])
+
+        assert texts == ["full 0", None, "full 2"]